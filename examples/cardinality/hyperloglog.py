@@ -20,9 +20,8 @@ if __name__ == '__main__':
 
     print("Counter contains approx. {} unique elements".format(hll.count()))
 
-    words = set(LOREM_IPSUM.split())
-    for word in words:
-        hll.add(word.strip(" .,"))
+    words = {word.strip(b" .,") for word in LOREM_IPSUM.encode().split()}
+    hll.add_many(words)
 
     print("Added {} words, in the counter approx. {} unique elements".format(
         len(words), hll.count()))
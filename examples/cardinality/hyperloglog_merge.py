@@ -0,0 +1,43 @@
+"""Example how to merge HyperLogLog counters.
+
+The text is sharded across several counters (e.g., one per worker),
+and the counters are merged into one to estimate the number of unique
+words in the whole text.
+"""
+
+from pdsa.cardinality.hyperloglog import HyperLogLog
+
+
+LOREM_IPSUM = (
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit."
+    " Mauris consequat leo ut vehicula placerat. In lacinia, nisl"
+    " id maximus auctor, sem elit interdum urna, at efficitur tellus"
+    " turpis at quam. Pellentesque eget iaculis turpis. Nam ac ligula"
+    " ut nunc porttitor pharetra in non lorem. In purus metus,"
+    " sollicitudin tristique sapien."
+)
+
+NUMBER_OF_SHARDS = 4
+
+
+if __name__ == '__main__':
+    words = [word.strip(b" .,") for word in LOREM_IPSUM.encode().split()]
+
+    baseline = HyperLogLog(10)
+    baseline.add_many(words)
+
+    shards = [HyperLogLog(10) for _ in range(NUMBER_OF_SHARDS)]
+    for shard_index, shard in enumerate(shards):
+        shard.add_many(words[shard_index::NUMBER_OF_SHARDS])
+        print("Shard {} contains approx. {} unique elements".format(
+            shard_index, shard.count()))
+
+    hll = HyperLogLog(10)
+    for shard in shards:
+        hll.merge(shard)
+
+    print("Merged counter contains approx. {} unique elements".format(
+        hll.count()))
+    print("Single counter contains approx. {} unique elements".format(
+        baseline.count()))
+    print("Exact number of unique elements: {}".format(len(set(words))))
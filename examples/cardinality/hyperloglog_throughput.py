@@ -0,0 +1,39 @@
+"""Example how to measure HyperLogLog throughput.
+
+Keys are prepared before the measurement starts, so the timing
+reflects the cost of the counter itself and not the cost of building
+Python strings. Bytes keys are hashed directly, without repr().
+"""
+import timeit
+
+from pdsa.cardinality.hyperloglog import HyperLogLog
+
+
+NUMBER_OF_ELEMENTS = 1000000
+
+
+def add_in_python_loop(hll, keys):
+    for key in keys:
+        hll.add(key)
+
+
+if __name__ == '__main__':
+    keys = [
+        "element_{}".format(i).encode("utf-8")
+        for i in range(NUMBER_OF_ELEMENTS)
+    ]
+
+    hll = HyperLogLog(14)
+    elapsed = timeit.timeit(lambda: add_in_python_loop(hll, keys), number=1)
+    print("add() in a Python loop: {:.0f} adds/s".format(
+        NUMBER_OF_ELEMENTS / elapsed))
+
+    hll = HyperLogLog(14)
+    elapsed = timeit.timeit(lambda: hll.add_many(keys), number=1)
+    print("add_many(): {:.0f} adds/s".format(NUMBER_OF_ELEMENTS / elapsed))
+
+    elapsed = timeit.timeit(hll.count, number=100)
+    print("count(): {:.0f} estimations/s".format(100 / elapsed))
+
+    print("Added {} unique elements, in the counter approx. {}".format(
+        NUMBER_OF_ELEMENTS, hll.count()))
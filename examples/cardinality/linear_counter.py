@@ -20,9 +20,8 @@ if __name__ == '__main__':
 
     print("Counter contains approx. {} unique elements".format(lc.count()))
 
-    words = set(LOREM_IPSUM.split())
-    for word in words:
-        lc.add(word.strip(" .,"))
+    words = {word.strip(b" .,") for word in LOREM_IPSUM.encode().split()}
+    lc.add_many(words)
 
     print("Added {} words, in the counter approx. {} unique elements".format(
         len(words), lc.count()))
@@ -20,9 +20,8 @@ if __name__ == '__main__':
 
     print("Counter contains approx. {} unique elements".format(pc.count()))
 
-    words = set(LOREM_IPSUM.split())
-    for word in words:
-        pc.add(word.strip(" .,"))
+    words = {word.strip(b" .,") for word in LOREM_IPSUM.encode().split()}
+    pc.add_many(words)
 
     print("Added {} words, in the counter approx. {} unique elements".format(
         len(words), pc.count()))
@@ -1,4 +1,5 @@
 """Example how to use Count-Min Sketch."""
+from collections import Counter
 
 from pdsa.frequency.count_min_sketch import CountMinSketch
 
@@ -20,7 +21,8 @@ if __name__ == '__main__':
     for digit in DATASET:
         cms.add(digit)
 
-    for digit in sorted(set(DATASET)):
+    frequencies = Counter(DATASET)
+    for digit in sorted(frequencies):
         print("Element: {}. Freq.: {}, Est. Freq.: {}".format(
-            digit, DATASET.count(digit), cms.frequency(digit)
+            digit, frequencies[digit], cms.frequency(digit)
         ))
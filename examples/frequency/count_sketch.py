@@ -1,4 +1,7 @@
 """Example how to use Count Sketch."""
+import timeit
+
+from collections import Counter
 
 from pdsa.frequency.count_sketch import CountSketch
 
@@ -16,11 +19,33 @@ if __name__ == '__main__':
     print(cs)
     print("CS uses {} bytes in the memory".format(cs.sizeof()))
 
-    for digit in DATASET:
-        cs.add(digit)
+    cs.add_many(DATASET)
 
-    for digit in sorted(set(DATASET)):
+    frequencies = Counter(DATASET)
+    for digit in sorted(frequencies):
         print("Element: {}. Freq.: {}, Est. Freq.: {}".format(
-            digit, DATASET.count(digit), cs.frequency(digit)
+            digit, frequencies[digit], cs.frequency(digit)
         ))
-          
\ No newline at end of file
+
+    # The more counter arrays, the more work per operation.
+    # Warm the sketch up with the dataset, then time a batch of operations
+    # instead of printing inside the loop, so only the sketch's
+    # per-operation cost is measured.
+    NUMBER_OF_OPERATIONS = 100000
+    for num_of_counters in (5, 10):
+        cs_complex = CountSketch(num_of_counters, 2000)
+        cs_complex.add_many(DATASET)
+
+        elapsed = timeit.timeit(
+            lambda: cs_complex.add("hello"), number=NUMBER_OF_OPERATIONS)
+        print("{}: {:.0f} adds/s".format(
+            cs_complex, NUMBER_OF_OPERATIONS / elapsed))
+
+        elapsed = timeit.timeit(
+            lambda: cs_complex.frequency("hello"),
+            number=NUMBER_OF_OPERATIONS)
+        print("{}: {:.0f} frequency queries/s".format(
+            cs_complex, NUMBER_OF_OPERATIONS / elapsed))
+
+        print("Element: hello. Est. Freq.: {}".format(
+            cs_complex.frequency("hello")))
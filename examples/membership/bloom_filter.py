@@ -1,4 +1,5 @@
 """Example how to use Classical Bloom Filter."""
+import sys
 
 from pdsa.membership.bloom_filter import BloomFilter
 
@@ -23,9 +24,8 @@ if __name__ == '__main__':
     print("'Lorem' {} in the filter".format(
         "is" if bf.test("Lorem") else "is not"))
 
-    words = set(LOREM_IPSUM.split())
-    for word in words:
-        bf.add(word.strip(" .,"))
+    words = {sys.intern(word.strip(" .,")) for word in LOREM_IPSUM.split()}
+    bf.add_many(words)
 
     print("Added {} words, in the filter approx. {} unique elements".format(
         len(words), bf.count()))
@@ -1,4 +1,5 @@
 """Example how to use Counting Bloom Filter."""
+import sys
 
 from pdsa.membership.counting_bloom_filter import CountingBloomFilter
 
@@ -23,9 +24,9 @@ if __name__ == '__main__':
     print("'Lorem' {} in the filter".format(
         "is" if bf.test("Lorem") else "is not"))
 
-    words = set(LOREM_IPSUM.split())
+    words = {sys.intern(word.strip(" .,")) for word in LOREM_IPSUM.split()}
     for word in words:
-        bf.add(word.strip(" .,"))
+        bf.add(word)
 
     print("Added {} words, in the filter approx. {} unique elements".format(
         len(words), bf.count()))
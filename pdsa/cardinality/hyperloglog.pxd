@@ -1,20 +1,24 @@
-from libc.stdint cimport uint8_t, uint16_t, uint32_t
-from cpython.array cimport array
+from libc.stdint cimport uint8_t, uint32_t
 
 cdef class HyperLogLog:
 
     cdef uint8_t precision
     cdef uint8_t size
-    cdef uint16_t num_of_counters
+    cdef uint32_t num_of_counters
 
-    cdef array _counter
+    cdef void* _buffer
+    cdef uint8_t* _registers
     cdef uint32_t _seed
     cdef float _alpha
 
     cpdef void add(self, object element) except *
+    cpdef void add_many(self, object elements) except *
     cpdef size_t count(self)
+    cpdef void merge(self, HyperLogLog other) except *
+    cpdef bytes to_bytes(self)
     cpdef size_t sizeof(self)
 
     cdef uint32_t _hash(self, object element, uint32_t seed)
     cdef float _weight(self)
-    cdef uint8_t _rank(self, uint32_t value)
+    cdef uint8_t _rank(self, uint32_t value) nogil
+    cdef void _add_hash(self, const uint32_t hash_value) nogil
@@ -1,3 +1,4 @@
+# cython: binding=False, infer_types=True
 """HyperLogLog.
 
 HyperLogLog algorithm was proposed by Philippe Flajolet, Éric Fusy,
@@ -10,12 +11,51 @@ counting the number of distinct values in the presence of duplicates.
 import cython
 
 from libc.math cimport log, round
-from libc.stdint cimport uint8_t, uint16_t, uint32_t
-from libc.stdlib cimport rand
+from libc.stdint cimport uint8_t, uint32_t, uint64_t, uintptr_t
+from libc.string cimport memcpy, memset
 
-from cpython.array cimport array
+from cpython.mem cimport PyMem_Malloc, PyMem_Free
 
-from pdsa.helpers.hashing.mmh cimport mmh3_x86_32bit
+from pdsa.helpers.hashing.xxh cimport xxh3_64bit
+
+
+cdef extern from *:
+    """
+    #if defined(_MSC_VER)
+    #include <intrin.h>
+    static inline int pdsa_clz32(uint32_t value) {
+        unsigned long index;
+        _BitScanReverse(&index, value);
+        return 31 - (int)index;
+    }
+    #else
+    #define pdsa_clz32(value) __builtin_clz(value)
+    #endif
+    """
+    # The result is undefined for 0, callers have to guarantee value != 0.
+    int pdsa_clz32(uint32_t value) nogil
+
+
+cdef inline double _inverse_power_of_two(uint64_t exponent) nogil:
+    """Compute 2^{-exponent} by building the IEEE 754 double directly.
+
+    It avoids both the division and the libm call, so the register
+    sweep in `count()` stays branch-free and can be vectorized.
+
+    """
+    cdef uint64_t bits = (<uint64_t>1023 - exponent) << 52
+    cdef double value
+    memcpy(&value, &bits, sizeof(double))
+    return value
+
+
+# Registers are kept in a cache-line aligned buffer, so that a merge
+# or a count sweep never straddles a cache line and can be vectorized.
+cdef size_t REGISTERS_ALIGNMENT = 64
+
+# `merge()` takes the register-wise maximum, which is only valid if both
+# counters route an element to the same register with the same rank.
+cdef uint32_t HASH_SEED = 0
 
 
 cdef class HyperLogLog:
@@ -32,8 +72,8 @@ cdef class HyperLogLog:
 
     Note
     -----
-        This implementation uses MurmurHash3 family of hash functions
-        which yields a 32-bit hash value. The maximal cardinality
+        This implementation uses the lower 32 bits of the XXH3 hash
+        value as a 32-bit hash value. The maximal cardinality
         is about 2^32 items.
 
     Attributes
@@ -81,36 +121,50 @@ cdef class HyperLogLog:
         self.num_of_counters = <uint32_t>1 << precision
         self.size = 32 - precision
 
-        self._counter = array('L', range(self.num_of_counters))
-        self._seed = <uint32_t>(rand())
-        self._alpha = self._weight()
+        self._buffer = PyMem_Malloc(
+            self.num_of_counters + REGISTERS_ALIGNMENT - 1)
+        if not self._buffer:
+            raise MemoryError()
 
-        cdef size_t index
-        for index in xrange(self.num_of_counters):
-            self._counter[index] = 0
+        self._registers = <uint8_t*>(
+            (<uintptr_t>self._buffer + REGISTERS_ALIGNMENT - 1) &
+            ~(<uintptr_t>REGISTERS_ALIGNMENT - 1))
+        memset(self._registers, 0, self.num_of_counters)
+
+        self._seed = HASH_SEED
+        self._alpha = self._weight()
 
     cdef uint32_t _hash(self, object key, uint32_t seed):
-        return mmh3_x86_32bit(key, seed)
+        return <uint32_t>xxh3_64bit(key, seed)
 
-    cdef uint8_t _rank(self, uint32_t value):
-        """Calculate rank that is the least significant bit position.
+    cdef uint8_t _rank(self, uint32_t value) nogil:
+        """Calculate rank that is the position of the leftmost 1-bit.
 
         Parameters
         ----------
         value : int
-            The unsinged integer to find the LSB in binary representation.
+            The unsinged integer (the `size` bits of the hash value
+            that are not used for indexing).
 
         Returns
         -------
         :obj:`int`
-            The LSB as the currect rank
+            The position of the leftmost 1-bit as the current rank.
+
+        Note
+        ----
+            The value is shifted to the top of the 32-bit word, so
+            the rank is a single count-leading-zeros instruction.
+            The sentinel bit right after the value's bits guarantees
+            a non-zero argument, and yields rank `size + 1` for 0.
 
         """
-        assert value.bit_length() < self.size + 1
-        return self.size - value.bit_length() + 1
+        return pdsa_clz32(
+            (value << self.precision) |
+            (<uint32_t>1 << (self.precision - 1))) + 1
 
     def __dealloc__(self):
-        pass
+        PyMem_Free(self._buffer)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -128,18 +182,123 @@ cdef class HyperLogLog:
             The algorithm uses only 1 hash function, thus, to
             calculate the rank and counter index, it computes
             quotient and remainder from the hash value and use them
-            respectively.
+            respectively. Since the number of counters is a power of 2,
+            they are computed with a shift and a mask.
+
+        """
+        self._add_hash(self._hash(element, self._seed))
+
+    cdef void _add_hash(self, const uint32_t hash_value) nogil:
+        """Update the register selected by the hash value.
+
+        Parameters
+        ----------
+        hash_value : :obj:`int`
+            The hash value of the element as computed by `_hash()`.
+
+        """
+        cdef uint32_t counter_index = hash_value & (self.num_of_counters - 1)
+        cdef uint8_t rank = self._rank(hash_value >> self.precision)
+        if rank > self._registers[counter_index]:
+            self._registers[counter_index] = rank
+
+    cpdef void add_many(self, object elements) except *:
+        """Index all elements from the iterable into the counter.
+
+        Parameters
+        ----------
+        elements : iterable
+            The elements to be indexed into the counter.
+
+        """
+        cdef object element
+        for element in elements:
+            self._add_hash(self._hash(element, self._seed))
+
+    cpdef void merge(self, HyperLogLog other) except *:
+        """Merge another counter into the current one.
+
+        Parameters
+        ----------
+        other : :obj:`HyperLogLog`
+            The counter to merge from.
+
+        Raises
+        ------
+        TypeError
+            If `other` is None.
+        ValueError
+            If the counters have different precisions.
+
+        Note
+        ----
+            After the merge the counter estimates the number of unique
+            elements in the union of both streams. Each register takes
+            the maximum of both registers, that is a byte-wise loop over
+            the aligned buffers that compilers turn into packed max
+            instructions.
+
+        """
+        if other is None:
+            raise TypeError("Cannot merge None into the counter")
+
+        if self.precision != other.precision:
+            raise ValueError("Only counters with the same precision can be merged")
+
+        cdef uint8_t* registers = self._registers
+        cdef uint8_t* other_registers = other._registers
+        cdef uint32_t counter_index
+        for counter_index in range(self.num_of_counters):
+            registers[counter_index] = max(
+                registers[counter_index], other_registers[counter_index])
+
+    cpdef bytes to_bytes(self):
+        """Export the registers of the counter.
+
+        Returns
+        -------
+        :obj:`bytes`
+            The registers, one byte per simple counter.
+
+        Note
+        ----
+            The precision is implied by the length of the exported
+            registers, so `from_bytes()` can restore the counter
+            without any additional metadata.
 
         """
-        cdef uint16_t counter_index
-        cdef uint32_t value
+        return self._registers[:self.num_of_counters]
 
-        value, counter_index = divmod(
-            self._hash(element, self._seed), self.num_of_counters)
+    @classmethod
+    def from_bytes(cls, const unsigned char[:] registers):
+        """Create HyperLogLog counter from previously exported registers.
 
-        self._counter[counter_index] = max(
-            self._counter[counter_index],
-            self._rank(value))
+        Parameters
+        ----------
+        registers : :obj:`bytes`
+            The registers exported by `to_bytes()`.
+
+        Returns
+        -------
+        :obj:`HyperLogLog`
+            The counter with a copy of the registers.
+
+        Raises
+        ------
+        ValueError
+            If the number of registers doesn't correspond to
+            any precision in the range 4...16.
+
+        """
+        cdef size_t num_of_counters = registers.shape[0]
+        if (num_of_counters < 16 or num_of_counters > 65536 or
+                num_of_counters & (num_of_counters - 1)):
+            raise ValueError("Number of registers has to be 2^precision")
+
+        cdef HyperLogLog hll = cls(
+            (<object>num_of_counters).bit_length() - 1)
+        memcpy(hll._registers, &registers[0], num_of_counters)
+        return hll
 
     cpdef size_t sizeof(self):
         """Size of the counter in bytes.
@@ -150,10 +309,14 @@ cdef class HyperLogLog:
             Number of bytes allocated for the counter.
 
         """
-        return self.num_of_counters * self._counter.itemsize
+        return self.num_of_counters * sizeof(uint8_t)
+
+    def __sizeof__(self):
+        """Size of the counter object in bytes, including its storage."""
+        return object.__sizeof__(self) + self.sizeof()
 
     def __repr__(self):
-        return "<HyperLogLog (length: {}, precision: {})>".format(
+        return "<HyperLogLog (length: %d, precision: %d)>" % (
             self.num_of_counters,
             self.precision)
 
@@ -170,7 +333,7 @@ cdef class HyperLogLog:
 
     def debug(self):
         """Return hll for debug purposes."""
-        return self._counter
+        return self._registers[:self.num_of_counters]
 
     @cython.boundscheck(False)
     @cython.cdivision(True)
@@ -211,28 +374,23 @@ cdef class HyperLogLog:
             Algorithms, Juan les Pins, France – June 17-22, 2007, pp. 127–146.
 
         """
-        cdef float R = 0
-        cdef uint16_t counter_index
-        cdef bint all_zero = 1
-        for counter_index in xrange(self.num_of_counters):
-            if self._counter[counter_index] > 0:
-                all_zero = 0
+        cdef uint8_t* registers = self._registers
 
-            R += 1.0 / float(<uint32_t>1 << self._counter[counter_index])
+        cdef double R = 0
+        cdef uint32_t Z = 0
+        cdef uint32_t counter_index
+        for counter_index in range(self.num_of_counters):
+            R += _inverse_power_of_two(registers[counter_index])
+            Z += registers[counter_index] == 0
 
-        if all_zero:
+        if Z == self.num_of_counters:
             return 0
 
         cdef size_t n = <size_t>round(
             self._alpha * self.num_of_counters * self.num_of_counters / R
         )
 
-        cdef uint16_t Z = 0
         if n < 2.5 * self.num_of_counters:
-            for counter_index in xrange(self.num_of_counters):
-                if self._counter[counter_index] == 0:
-                    Z += 1
-
             if Z > 0:
                 return <size_t>round(
                     self.num_of_counters * (log(self.num_of_counters) - log(Z))
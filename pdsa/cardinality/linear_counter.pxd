@@ -11,6 +11,7 @@ cdef class LinearCounter:
     cdef BitVector _counter
 
     cpdef void add(self, object element) except *
+    cpdef void add_many(self, object elements) except *
     cpdef size_t count(self)
     cpdef size_t sizeof(self)
 
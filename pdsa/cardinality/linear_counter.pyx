@@ -1,3 +1,4 @@
+# cython: binding=False, infer_types=True
 """Linear Counter.
 
 A Linear-Time probabilistic counting algorithm, or Linear Counting algorithm,
@@ -73,10 +74,6 @@ cdef class LinearCounter:
 
         self.length = len(self._counter)
 
-        cdef size_t index
-        for index in xrange(self.length):
-            self._counter[index] = 0
-
 
     cdef uint32_t _hash(self, object key, uint8_t seed):
         # self.algorithm = "mmh3_x86_32bit"
@@ -97,9 +94,24 @@ cdef class LinearCounter:
             The element to be indexed into the counter.
 
         """
-        cdef size_t index
-        index = self._hash(element, self._seed) % self.length
-        self._counter[index] = 1
+        self._counter._set_bit(self._hash(element, self._seed) % self.length, 1)
+
+    cpdef void add_many(self, object elements) except *:
+        """Index all elements from the iterable into the counter.
+
+        Parameters
+        ----------
+        elements : iterable
+            The elements to be indexed into the counter.
+
+        """
+        cdef BitVector counter = self._counter
+        cdef size_t length = self.length
+        cdef uint8_t seed = self._seed
+
+        cdef object element
+        for element in elements:
+            counter._set_bit(self._hash(element, seed) % length, 1)
 
     cpdef size_t sizeof(self):
         """Size of the counter in bytes.
@@ -112,8 +124,12 @@ cdef class LinearCounter:
         """
         return self._counter.sizeof()
 
+    def __sizeof__(self):
+        """Size of the counter object in bytes, including its storage."""
+        return object.__sizeof__(self) + self.sizeof()
+
     def __repr__(self):
-        return "<LinearCounter (length: {})>".format(self.length)
+        return "<LinearCounter (length: %d)>" % self.length
 
     def __len__(self):
         """Get length of the counter.
@@ -13,6 +13,7 @@ cdef class ProbabilisticCounter:
     cdef BitVector _counter
 
     cpdef void add(self, object element) except *
+    cpdef void add_many(self, object elements) except *
     cpdef size_t count(self)
     cpdef size_t sizeof(self)
 
@@ -1,3 +1,4 @@
+# cython: binding=False, infer_types=True
 """Probabilistic Counter (with sotchastic averaging).
 
 Probabilistic Counting algorithm (Flajolet-Martin algorithm) was
@@ -11,7 +12,6 @@ import cython
 
 from libc.math cimport round
 from libc.stdint cimport uint8_t, uint16_t, uint32_t
-from libc.stdlib cimport rand
 
 from cpython.array cimport array
 from cpython.mem cimport PyMem_Malloc, PyMem_Free
@@ -19,6 +19,28 @@ from cpython.mem cimport PyMem_Malloc, PyMem_Free
 from pdsa.helpers.hashing.mmh cimport mmh3_x86_32bit
 
 
+cdef extern from *:
+    """
+    #if defined(_MSC_VER)
+    #include <intrin.h>
+    static inline int pdsa_ctz32(uint32_t value) {
+        unsigned long index;
+        _BitScanForward(&index, value);
+        return (int)index;
+    }
+    #else
+    #define pdsa_ctz32(value) __builtin_ctz(value)
+    #endif
+    """
+    # The result is undefined for 0, callers have to guarantee value != 0.
+    int pdsa_ctz32(uint32_t value) nogil
+
+
+# The hash seed is fixed, so the estimation for the same stream is
+# reproducible and does not depend on the state of the C library `rand()`.
+cdef uint32_t HASH_SEED = 0
+
+
 cdef class ProbabilisticCounter:
     """Probabilistic Counter is a realisation of Flajolet-Martin algorithm.
 
@@ -91,15 +113,11 @@ cdef class ProbabilisticCounter:
         self.size = 32  # 32-bit hash functions produce 0..2^{32}-1 values
         self.with_small_cardinality_correction = with_small_cardinality_correction
 
-        self._seed = <uint8_t>(rand())
+        self._seed = HASH_SEED
         self._counter = BitVector(self.num_of_counters * self.size)
 
         self.length = len(self._counter)
 
-        cdef size_t index
-        for index in xrange(self.length):
-            self._counter[index] = 0
-
     cdef uint32_t _hash(self, object key, uint32_t seed):
         return mmh3_x86_32bit(key, seed)
 
@@ -119,7 +137,7 @@ cdef class ProbabilisticCounter:
         """
         if value == 0:
             return self.size
-        return (value & -value).bit_length() - 1
+        return pdsa_ctz32(value)
 
     def __dealloc__(self):
         pass
@@ -143,16 +161,28 @@ cdef class ProbabilisticCounter:
             respectively.
 
         """
-        cdef uint16_t counter_index
-        cdef uint32_t value
+        cdef uint32_t hash_value = self._hash(element, self._seed)
+        cdef uint16_t counter_index = hash_value % self.num_of_counters
+        cdef uint32_t value = hash_value / self.num_of_counters
         cdef uint8_t value_index
 
-        value, counter_index = divmod(
-            self._hash(element, self._seed), self.num_of_counters)
-
         value_index = self._rank(value)
         if value_index < self.size:
-            self._counter[counter_index * self.size + value_index] = 1
+            self._counter._set_bit(
+                <size_t>counter_index * self.size + value_index, 1)
+
+    cpdef void add_many(self, object elements) except *:
+        """Index all elements from the iterable into the counter.
+
+        Parameters
+        ----------
+        elements : iterable
+            The elements to be indexed into the counter.
+
+        """
+        cdef object element
+        for element in elements:
+            self.add(element)
 
     cpdef size_t sizeof(self):
         """Size of the counter in bytes.
@@ -165,8 +195,12 @@ cdef class ProbabilisticCounter:
         """
         return self._counter.sizeof()
 
+    def __sizeof__(self):
+        """Size of the counter object in bytes, including its storage."""
+        return object.__sizeof__(self) + self.sizeof()
+
     def __repr__(self):
-        return "<ProbabilisticCounter (length: {}, num_of_counters: {})>".format(
+        return "<ProbabilisticCounter (length: %d, num_of_counters: %d)>" % (
             self.length,
             self.num_of_counters)
 
@@ -8,7 +8,6 @@ cdef class CountMinSketch:
     cdef uint32_t length_of_counter
 
     cdef uint64_t _length
-    cdef uint8_t[:] _seeds
     cdef uint32_t[:] _counter
 
     cpdef void add(self, object element) except *
@@ -16,4 +15,4 @@ cdef class CountMinSketch:
     cpdef size_t sizeof(self)
 
     cdef bint _increment_counter(self, const uint64_t index)
-    cdef uint32_t _hash(self, object element, uint8_t seed)
+    cdef void _hash(self, object element, uint64_t* out) except *
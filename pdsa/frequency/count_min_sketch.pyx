@@ -1,3 +1,4 @@
+# cython: binding=False, infer_types=True
 """
 Count-Min Sketch.
 
@@ -25,10 +26,15 @@ import cython
 from cpython.array cimport array
 from libc.math cimport ceil, log, M_E
 from libc.stdint cimport uint64_t, uint32_t, uint8_t
-from libc.stdint cimport UINT32_MAX, UINT8_MAX
-from libc.stdlib cimport rand, RAND_MAX
+from libc.stdint cimport UINT32_MAX
 
-from pdsa.helpers.hashing.mmh cimport mmh3_x86_32bit
+from pdsa.helpers.hashing.fastrange cimport pdsa_fastrange64
+from pdsa.helpers.hashing.xxh cimport xxh3_128bit_pair
+
+
+# The seed of the single XXH3 hash, from which the column of an element
+# in every row is derived as g_i = h1 + i * h2.
+cdef uint64_t HASH_SEED = 0
 
 
 cdef class CountMinSketch:
@@ -50,10 +56,11 @@ cdef class CountMinSketch:
 
     Note
     -----
-        This implementation uses MurmurHash3 family of hash functions
-        which yields a 32-bit hash value. Thus, the length of the counters
-        is expected to be smaller or equal to the (2^{32} - 1), since
-        we cannot access elements with indexes above this value.
+        This implementation uses XXH3 hash function which yields
+        a 128-bit hash value. Both 64-bit halves h1 and h2 of a single
+        hash value generate indices in all counter arrays as h1 + i * h2.
+        The length of the counters is expected to be smaller or equal
+        to the (2^{32} - 1).
 
     Note
     -----
@@ -100,10 +107,6 @@ cdef class CountMinSketch:
         self._length = self.num_of_counters * self.length_of_counter
 
         self._MAX_COUNTER_VALUE = UINT32_MAX
-        self._seeds = array('B', [
-            <uint8_t >((rand()/RAND_MAX) * UINT8_MAX)
-            for r in range(self.num_of_counters)
-        ])
         self._counter = array('I', range(self._length))
 
         cdef uint64_t index
@@ -151,8 +154,8 @@ cdef class CountMinSketch:
 
         return cls(max(1, num_of_counters), max(1, length_of_counter))
 
-    cdef uint32_t _hash(self, object key, uint8_t seed):
-        return mmh3_x86_32bit(key, seed)
+    cdef void _hash(self, object key, uint64_t* out) except *:
+        xxh3_128bit_pair(key, HASH_SEED, out)
 
     def __dealloc__(self):
         pass
@@ -187,15 +190,17 @@ cdef class CountMinSketch:
             The element to be indexed into the sketch.
 
         """
+        cdef uint64_t hash_value[2]
+        self._hash(element, hash_value)
+
+        cdef uint64_t position = hash_value[0]
         cdef uint8_t counter_index
-        cdef uint32_t element_index
-        cdef uint8_t seed
         cdef uint64_t index
         for counter_index in range(self.num_of_counters):
-            seed = self._seeds[counter_index]
-            element_index = self._hash(element, seed) % self.length_of_counter
-            index = counter_index * (self.length_of_counter - 1) + element_index
+            index = <uint64_t>counter_index * self.length_of_counter
+            index += pdsa_fastrange64(position, self.length_of_counter)
             self._increment_counter(index)
+            position += hash_value[1]
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -214,16 +219,18 @@ cdef class CountMinSketch:
             The frequency of the element.
 
         """
+        cdef uint64_t hash_value[2]
+        self._hash(element, hash_value)
+
+        cdef uint64_t position = hash_value[0]
         cdef uint8_t counter_index
-        cdef uint32_t element_index
-        cdef uint8_t seed
         cdef uint64_t index
         cdef uint32_t frequency = self._MAX_COUNTER_VALUE
         for counter_index in range(self.num_of_counters):
-            seed = self._seeds[counter_index]
-            element_index = self._hash(element, seed) % self.length_of_counter
-            index = counter_index * (self.length_of_counter - 1) + element_index
+            index = <uint64_t>counter_index * self.length_of_counter
+            index += pdsa_fastrange64(position, self.length_of_counter)
             frequency = min(frequency, self._counter[index])
+            position += hash_value[1]
         return frequency
 
     cpdef size_t sizeof(self):
@@ -237,8 +244,12 @@ cdef class CountMinSketch:
         """
         return self._length * self._counter.itemsize
 
+    def __sizeof__(self):
+        """Size of the sketch object in bytes, including its storage."""
+        return object.__sizeof__(self) + self.sizeof()
+
     def __repr__(self):
-        return "<CountMinSketch ({} x {})>".format(
+        return "<CountMinSketch (%d x %d)>" % (
             self.num_of_counters,
             self.length_of_counter
         )
@@ -10,13 +10,21 @@ cdef class CountSketch:
     cdef uint32_t length_of_counter
 
     cdef uint64_t _length
-    cdef uint8_t[:] _seeds
-    cdef uint8_t[:] _seeds_for_switcher
-    cdef int32_t[:] _counter
+    cdef uint32_t _seed
+
+    cdef void* _buffer
+    cdef int32_t* _counter
 
     cpdef void add(self, object element) except *
+    cpdef void add_many(self, object elements) except *
     cpdef uint32_t frequency(self, object element) except *
+    cpdef void reset(self)
+    cpdef void merge(self, CountSketch other) except *
     cpdef size_t sizeof(self)
 
-    cdef bint _update_counter(self, const uint64_t index, const bint reverse)
-    cdef uint32_t _hash(self, object element, uint8_t seed)
+    cdef bint _update_counter(self, const uint64_t index, const bint reverse) nogil
+    cdef void _hash(self, object element, uint64_t* out) except *
+    cdef uint64_t _index(self, const uint64_t value, const uint8_t counter_index) nogil
+    cdef void _add_hash(self, const uint64_t* hash_value) nogil
+    cdef void _prefetch_hash(self, const uint64_t* hash_value) nogil
+    cdef void _add_hashes(self, const uint64_t* hash_values, const size_t count) nogil
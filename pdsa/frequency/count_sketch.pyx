@@ -1,3 +1,4 @@
+# cython: binding=False, infer_types=True
 """
 Count Sketch.
 
@@ -20,11 +21,41 @@ from statistics import median
 
 from cpython.array cimport array
 from libc.math cimport ceil, log, M_E
-from libc.stdint cimport uint64_t, uint32_t, uint8_t
-from libc.stdint cimport INT32_MAX, INT32_MIN, UINT8_MAX
-from libc.stdlib cimport rand, RAND_MAX
+from libc.stdint cimport uint64_t, uint32_t, uint8_t, int32_t, int64_t
+from libc.stdint cimport INT32_MAX, INT32_MIN, uintptr_t
+from libc.stdlib cimport calloc, free
 
-from pdsa.helpers.hashing.mmh cimport mmh3_x86_32bit
+from pdsa.helpers.hashing.xxh cimport xxh3_128bit_pair
+
+
+cdef extern from *:
+    """
+    #if defined(_MSC_VER)
+    #include <xmmintrin.h>
+    #define pdsa_prefetch_write(address) \
+        _mm_prefetch((const char*)(address), _MM_HINT_T0)
+    #else
+    #define pdsa_prefetch_write(address) __builtin_prefetch((address), 1, 3)
+    #endif
+    """
+    void pdsa_prefetch_write(const void* address) nogil
+
+
+# Counter arrays are stored one after another in a buffer that is
+# aligned to the cache line, so no counter straddles two lines.
+cdef uint32_t CACHE_LINE_SIZE = 64
+
+# `merge()` adds counters pairwise, which is only valid if both sketches
+# put an element into the same counters with the same sign.
+cdef uint32_t HASH_SEED = 0
+
+# The number of elements that `add_many()` hashes before it updates
+# their counters.
+DEF ADD_MANY_BATCH_SIZE = 256
+
+# How many elements ahead the counters of an element are prefetched
+# while a batch of counters is updated.
+DEF PREFETCH_DISTANCE = 8
 
 
 cdef class CountSketch:
@@ -46,10 +77,10 @@ cdef class CountSketch:
 
     Note
     -----
-        This implementation uses MurmurHash3 family of hash functions
-        which yields a 32-bit hash value. Thus, the length of the counters
-        is expected to be smaller or equal to the (2^{32} - 1), since
-        we cannot access elements with indexes above this value.
+        This implementation computes a single 128-bit XXH3 hash value
+        per element and derives the index and the sign for every counter
+        array from its two 64-bit halves (Kirsch-Mitzenmacher).
+        The length of the counters is limited to (2^{32} - 1).
 
     Note
     -----
@@ -98,20 +129,16 @@ cdef class CountSketch:
         self._MAX_COUNTER_VALUE = INT32_MAX
         self._MIN_COUNTER_VALUE = INT32_MIN
 
-        self._seeds = array('B', [
-            <uint8_t >((rand()/RAND_MAX) * UINT8_MAX)
-            for r in range(self.num_of_counters)
-        ])
-        self._seeds_for_switcher = array('B', [
-            <uint8_t >((rand()/RAND_MAX) * UINT8_MAX)
-            for r in range(self.num_of_counters)
-        ])
+        self._seed = HASH_SEED
 
-        self._counter = array('i', range(self._length))
+        self._buffer = calloc(
+            self._length * sizeof(int32_t) + CACHE_LINE_SIZE - 1, 1)
+        if not self._buffer:
+            raise MemoryError()
 
-        cdef uint64_t index
-        for index in xrange(self._length):
-            self._counter[index] = 0
+        self._counter = <int32_t*>(
+            (<uintptr_t>self._buffer + CACHE_LINE_SIZE - 1) &
+            ~(<uintptr_t>CACHE_LINE_SIZE - 1))
 
     @classmethod
     def create_from_expected_error(cls, const float deviation, const float error):
@@ -155,13 +182,54 @@ cdef class CountSketch:
 
         return cls(max(1, num_of_counters), max(1, length_of_counter))
 
-    cdef uint32_t _hash(self, object key, uint8_t seed):
-        return mmh3_x86_32bit(key, seed)
+    cdef void _hash(self, object key, uint64_t* out) except *:
+        """Compute the base hash pair for the element.
+
+        Parameters
+        ----------
+        key : obj
+            The element to compute the hash value for.
+        out : uint64_t*
+            The buffer of two 64-bit words that receives the hash value.
+
+        Note
+        ----
+            The second half is forced to be odd, so the derived hash
+            values g_i = h1 + i * h2 never collapse to the same value.
+
+        References
+        ----------
+        [1] Kirsch, A., Mitzenmacher, M.
+            Less Hashing, Same Performance: Building a Better Bloom Filter
+            Random Structures & Algorithms, 33(2), pp. 187–218, 2008.
+
+        """
+        xxh3_128bit_pair(key, self._seed, out)
+        out[1] |= 1
+
+    cdef uint64_t _index(self, const uint64_t value, const uint8_t counter_index) nogil:
+        """Find the counter of the element in the given counter array.
+
+        Parameters
+        ----------
+        value : uint64_t
+            The derived hash value g_i of the element for the array.
+        counter_index : :obj:`int`
+            The index of the counter array.
+
+        Note
+        ----
+            The position is taken from the low 32 bits of g_i,
+            while the sign is its highest bit, so both are independent.
+
+        """
+        return (counter_index * <uint64_t>self.length_of_counter +
+                ((<uint32_t>value * <uint64_t>self.length_of_counter) >> 32))
 
     def __dealloc__(self):
-        pass
+        free(self._buffer)
 
-    cdef bint _update_counter(self, const uint64_t index, const bint reverse):
+    cdef bint _update_counter(self, const uint64_t index, const bint reverse) nogil:
         """Increment counter if the value doesn't exceed maximal allowed.
 
         Parameters
@@ -187,9 +255,59 @@ cdef class CountSketch:
 
         return False
 
-    @cython.boundscheck(False)
-    @cython.wraparound(False)
     @cython.cdivision(True)
+    cdef void _add_hash(self, const uint64_t* hash_value) nogil:
+        """Update counters of the element with the given hash pair.
+
+        Parameters
+        ----------
+        hash_value : uint64_t*
+            The hash pair (h1, h2) of the element as computed by `_hash()`.
+
+        """
+        cdef uint8_t counter_index
+        cdef uint64_t value
+        for counter_index in range(self.num_of_counters):
+            value = hash_value[0] + counter_index * hash_value[1]
+            self._update_counter(self._index(value, counter_index), value >> 63)
+
+    cdef void _prefetch_hash(self, const uint64_t* hash_value) nogil:
+        """Prefetch counters of the element with the given hash pair.
+
+        Parameters
+        ----------
+        hash_value : uint64_t*
+            The hash pair (h1, h2) of the element as computed by `_hash()`.
+
+        """
+        cdef uint8_t counter_index
+        for counter_index in range(self.num_of_counters):
+            pdsa_prefetch_write(self._counter + self._index(
+                hash_value[0] + counter_index * hash_value[1], counter_index))
+
+    cdef void _add_hashes(self, const uint64_t* hash_values, const size_t count) nogil:
+        """Update counters of the elements with the given hash pairs.
+
+        Parameters
+        ----------
+        hash_values : uint64_t*
+            The array of `count` hash pairs, stored one after another.
+        count : :obj:`int`
+            The number of hash pairs in the array.
+
+        Note
+        ----
+            Counters of a later element are prefetched while the current
+            one is updated, which hides memory latency for large sketches.
+
+        """
+        cdef size_t element_index
+        for element_index in range(count):
+            if element_index + PREFETCH_DISTANCE < count:
+                self._prefetch_hash(
+                    hash_values + 2 * (element_index + PREFETCH_DISTANCE))
+            self._add_hash(hash_values + 2 * element_index)
+
     cpdef void add(self, object element) except *:
         """Index element into the sketch.
 
@@ -199,19 +317,37 @@ cdef class CountSketch:
             The element to be indexed into the sketch.
 
         """
-        cdef uint8_t counter_index
-        cdef uint32_t element_index
-        cdef uint8_t seed
-        cdef uint64_t index
-        cdef bint reverse
-        for counter_index in range(self.num_of_counters):
-            seed = self._seeds[counter_index]
-            element_index = self._hash(element, seed) % self.length_of_counter
-            index = counter_index * (self.length_of_counter - 1) + element_index
+        cdef uint64_t hash_value[2]
+        self._hash(element, hash_value)
+        self._add_hash(hash_value)
+
+    cpdef void add_many(self, object elements) except *:
+        """Index all elements from the iterable into the sketch.
+
+        Parameters
+        ----------
+        elements : iterable
+            The elements to be indexed into the sketch.
 
-            seed_for_switcher = self._seeds_for_switcher[counter_index]
-            reverse = self._hash(element, seed_for_switcher) % 2
-            self._update_counter(index, reverse)
+        Note
+        ----
+            Elements are hashed in batches, and the counters of each
+            batch are updated afterwards, so the counters of later
+            elements can be prefetched.
+
+        """
+        cdef uint64_t hash_values[2 * ADD_MANY_BATCH_SIZE]
+        cdef size_t count = 0
+        cdef object element
+        for element in elements:
+            self._hash(element, hash_values + 2 * count)
+            count += 1
+
+            if count == ADD_MANY_BATCH_SIZE:
+                self._add_hashes(hash_values, count)
+                count = 0
+
+        self._add_hashes(hash_values, count)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -231,26 +367,92 @@ cdef class CountSketch:
 
         """
         cdef uint8_t counter_index
-        cdef uint32_t element_index
-        cdef uint8_t seed
+        cdef uint64_t hash_value[2]
+        cdef uint64_t value
         cdef uint64_t index
         cdef bint reverse
 
-        cdef uint32_t[:] frequencies
-        frequencies = array('I', [0] * self.num_of_counters)
+        cdef int32_t[:] frequencies
+        frequencies = array('i', [0] * self.num_of_counters)
 
+        self._hash(element, hash_value)
         for counter_index in range(self.num_of_counters):
-            seed = self._seeds[counter_index]
-            element_index = self._hash(element, seed) % self.length_of_counter
-            index = counter_index * (self.length_of_counter - 1) + element_index
-
-            seed_for_switcher = self._seeds_for_switcher[counter_index]
-            reverse = self._hash(element, seed_for_switcher) % 2
+            value = hash_value[0] + counter_index * hash_value[1]
+            index = self._index(value, counter_index)
+            reverse = value >> 63
 
             frequency = self._counter[index] * (-1 if reverse else 1)
             frequencies[counter_index] = frequency
 
-        return median(frequencies)
+        # Colliding elements can drive the estimate below zero,
+        # while the frequency itself cannot be negative.
+        return <uint32_t>max(0, median(frequencies))
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cpdef void reset(self):
+        """Age the sketch by halving all its counters.
+
+        Note
+        ----
+            This is the aging (decay) process of TinyLFU: after a reset
+            recent elements dominate the estimations, while the frequencies
+            of old elements fade away. The halving truncates towards zero,
+            so both positive and negative counters decay.
+
+        References
+        ----------
+        [1] Einziger, G., Friedman, R., Manes, B.
+            TinyLFU: A Highly Efficient Cache Admission Policy
+            ACM Transactions on Storage, 13(4), 2017.
+
+        """
+        cdef int32_t* counter = self._counter
+        cdef uint64_t index
+        for index in range(self._length):
+            counter[index] = counter[index] // 2
+
+    cpdef void merge(self, CountSketch other) except *:
+        """Merge another sketch into the current one.
+
+        Parameters
+        ----------
+        other : :obj:`CountSketch`
+            The sketch to merge from.
+
+        Raises
+        ------
+        TypeError
+            If `other` is None.
+        ValueError
+            If the sketches have different dimensions.
+
+        Note
+        ----
+            After the merge the sketch estimates frequencies in the union
+            of both streams. Counters are added pairwise and, as in `add()`,
+            freeze at their minimal and maximal values.
+
+        """
+        if other is None:
+            raise TypeError("Cannot merge None into the sketch")
+
+        if (self.num_of_counters != other.num_of_counters or
+                self.length_of_counter != other.length_of_counter):
+            raise ValueError("Only sketches with the same dimensions can be merged")
+
+        cdef int32_t* counter = self._counter
+        cdef int32_t* other_counter = other._counter
+        cdef int64_t value
+        cdef uint64_t index
+        for index in range(self._length):
+            value = <int64_t>counter[index] + other_counter[index]
+            if value > self._MAX_COUNTER_VALUE:
+                value = self._MAX_COUNTER_VALUE
+            elif value < self._MIN_COUNTER_VALUE:
+                value = self._MIN_COUNTER_VALUE
+            counter[index] = <int32_t>value
 
     cpdef size_t sizeof(self):
         """Size of the sketch in bytes.
@@ -261,10 +463,14 @@ cdef class CountSketch:
             Number of bytes allocated for the sketch.
 
         """
-        return self._length * self._counter.itemsize
+        return self._length * sizeof(int32_t)
+
+    def __sizeof__(self):
+        """Size of the sketch object in bytes, including its storage."""
+        return object.__sizeof__(self) + self.sizeof()
 
     def __repr__(self):
-        return "<CountSketch ({} x {})>".format(
+        return "<CountSketch (%d x %d)>" % (
             self.num_of_counters,
             self.length_of_counter
         )
@@ -280,8 +486,9 @@ cdef class CountSketch:
         """
         return self._length
 
-
-
     def debug(self):
         """Return sketch for debug purposes."""
-        return self._counter
+        return [
+            self._counter[index]
+            for index in range(self._length)
+        ]
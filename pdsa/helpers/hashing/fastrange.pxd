@@ -0,0 +1,19 @@
+from libc.stdint cimport uint64_t
+
+
+cdef extern from *:
+    """
+    #if defined(_MSC_VER) && defined(_M_X64)
+    #include <intrin.h>
+    #define pdsa_fastrange64(value, range) __umulh((value), (range))
+    #elif defined(__SIZEOF_INT128__)
+    #define pdsa_fastrange64(value, range) \\
+        ((uint64_t)(((unsigned __int128)(value) * (range)) >> 64))
+    #else
+    #define pdsa_fastrange64(value, range) ((value) % (range))
+    #endif
+    """
+    # Map a 64-bit hash value into [0, range) by a multiplication
+    # and a shift instead of a division (D. Lemire, 2016). It uses
+    # the high bits of the value, so it keeps the hash uniformity.
+    uint64_t pdsa_fastrange64(uint64_t value, uint64_t range) nogil
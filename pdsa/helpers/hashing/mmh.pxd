@@ -1,6 +1,12 @@
-from libc.stdint cimport uint32_t
+from libc.stdint cimport uint32_t, uint64_t
 
 cdef uint32_t mmh3_x86_32bit_bytes(bytes key, uint32_t seed=*)
-cdef uint32_t mmh3_x86_32bit_int(int key, uint32_t seed=*)
+cdef uint32_t mmh3_x86_32bit_int(long long key, uint32_t seed=*)
 
 cpdef uint32_t mmh3_x86_32bit(object key, uint32_t seed=*)
+
+cdef void mmh3_x64_128bit_bytes(bytes key, uint32_t seed, uint64_t* out)
+cdef void mmh3_x64_128bit_int(long long key, uint32_t seed, uint64_t* out)
+cdef void mmh3_x64_128bit_pair(object key, uint32_t seed, uint64_t* out) except *
+
+cpdef tuple mmh3_x64_128bit(object key, uint32_t seed=*)
@@ -1,25 +1,40 @@
+# cython: binding=False, infer_types=True
 """Cython interface to MurmurHash3 C++ code by A. Appleby
 
 MurmurHash3 is a non-cryptographic hash function.
 https://github.com/aappleby/smhasher/wiki/MurmurHash3
 
 For probabilistic data structures the 32-bit version is used
-that produces low latency hash values.
+that produces low latency hash values. The x64 128-bit version is
+used where a single call has to feed several hash functions.
 """
-from libc.stdint cimport uint32_t
+from libc.stdint cimport uint32_t, uint64_t
+
+from libc.limits cimport INT_MIN, INT_MAX
+
+from cpython.bytes cimport PyBytes_AS_STRING, PyBytes_GET_SIZE
+
+from pdsa.helpers.hashing.pylong cimport as_long_long
 
 cdef extern from "src/MurmurHash3.h":
    void MurmurHash3_x86_32(void* key, int len, uint32_t seed, void* out)
+   void MurmurHash3_x64_128(void* key, int len, uint32_t seed, void* out)
 
 
 cdef uint32_t mmh3_x86_32bit_bytes(bytes key, uint32_t seed=42):
     cdef uint32_t hash_value
-    MurmurHash3_x86_32(<char*> key, len(key), seed, &hash_value)
+    MurmurHash3_x86_32(
+        PyBytes_AS_STRING(key), PyBytes_GET_SIZE(key), seed, &hash_value)
     return hash_value
 
-cdef uint32_t mmh3_x86_32bit_int(int key, uint32_t seed=42):
+cdef uint32_t mmh3_x86_32bit_int(long long key, uint32_t seed=42):
     cdef uint32_t hash_value
-    MurmurHash3_x86_32(&key, sizeof(key), seed, &hash_value)
+    cdef int short_key
+    if INT_MIN <= key <= INT_MAX:
+        short_key = <int>key
+        MurmurHash3_x86_32(&short_key, sizeof(short_key), seed, &hash_value)
+    else:
+        MurmurHash3_x86_32(&key, sizeof(key), seed, &hash_value)
     return hash_value
 
 
@@ -34,11 +49,74 @@ cpdef uint32_t mmh3_x86_32bit(object key, uint32_t seed=42):
         The seed to support reproducable hash calculation.
 
     """
-    if isinstance(key, int):
-        return mmh3_x86_32bit_int(<int>key, seed)
-
     if isinstance(key, bytes):
         return mmh3_x86_32bit_bytes(key, seed)
 
+    cdef long long value
+    if isinstance(key, int) and as_long_long(key, &value):
+        return mmh3_x86_32bit_int(value, seed)
+
     return mmh3_x86_32bit_bytes(repr(key).encode("utf-8"), seed)
 
+
+
+cdef void mmh3_x64_128bit_bytes(bytes key, uint32_t seed, uint64_t* out):
+    MurmurHash3_x64_128(
+        PyBytes_AS_STRING(key), PyBytes_GET_SIZE(key), seed, out)
+
+cdef void mmh3_x64_128bit_int(long long key, uint32_t seed, uint64_t* out):
+    cdef int short_key
+    if INT_MIN <= key <= INT_MAX:
+        short_key = <int>key
+        MurmurHash3_x64_128(&short_key, sizeof(short_key), seed, out)
+    else:
+        MurmurHash3_x64_128(&key, sizeof(key), seed, out)
+
+
+cdef void mmh3_x64_128bit_pair(object key, uint32_t seed, uint64_t* out) except *:
+    """Compute x64 128bit MurmurHash3 hash value into two 64-bit halves.
+
+    Parameters
+    ----------
+    key : obj
+        The object to compute the hash value from.
+    seed : :obj:`int`
+        The seed to support reproducable hash calculation.
+    out : uint64_t*
+        The buffer of two 64-bit words that receives the hash value.
+
+    """
+    cdef long long value
+    if isinstance(key, bytes):
+        mmh3_x64_128bit_bytes(key, seed, out)
+    elif isinstance(key, int) and as_long_long(key, &value):
+        mmh3_x64_128bit_int(value, seed, out)
+    else:
+        mmh3_x64_128bit_bytes(repr(key).encode("utf-8"), seed, out)
+
+
+cpdef tuple mmh3_x64_128bit(object key, uint32_t seed=42):
+    """Compute x64 128bit MurmurHash3 hash value.
+
+    Parameters
+    ----------
+    key : obj
+        The object to compute the hash value from.
+    seed : :obj:`int`
+        The seed to support reproducable hash calculation.
+
+    Returns
+    -------
+    :obj:`tuple`
+        The pair of 64-bit halves (h1, h2) of the hash value.
+
+    Note
+    ----
+        Following Kirsch and Mitzenmacher, the halves can be combined
+        as h1 + i * h2 to simulate any number of independent hash
+        functions from a single hash computation.
+
+    """
+    cdef uint64_t out[2]
+    mmh3_x64_128bit_pair(key, seed, out)
+    return out[0], out[1]
@@ -0,0 +1,15 @@
+cdef extern from "Python.h":
+    long long PyLong_AsLongLongAndOverflow(object key, int* overflow) except? -1
+
+
+cdef inline bint as_long_long(object key, long long* value) except -1:
+    """Convert an integer key to C `long long`, if it fits.
+
+    Keys that fit into C `int` are hashed as 4 bytes and the other
+    keys that fit into `long long` as 8 bytes. Larger integers are
+    hashed by their representation, like arbitrary objects.
+
+    """
+    cdef int overflow
+    value[0] = PyLong_AsLongLongAndOverflow(key, &overflow)
+    return overflow == 0
@@ -0,0 +1,12 @@
+from libc.stdint cimport uint64_t
+
+cdef uint64_t xxh3_64bit_bytes(bytes key, uint64_t seed=*)
+cdef uint64_t xxh3_64bit_int(long long key, uint64_t seed=*)
+
+cpdef uint64_t xxh3_64bit(object key, uint64_t seed=*)
+
+cdef void xxh3_128bit_bytes(bytes key, uint64_t seed, uint64_t* out)
+cdef void xxh3_128bit_int(long long key, uint64_t seed, uint64_t* out)
+cdef void xxh3_128bit_pair(object key, uint64_t seed, uint64_t* out) except *
+
+cpdef tuple xxh3_128bit(object key, uint64_t seed=*)
@@ -0,0 +1,124 @@
+# cython: binding=False, infer_types=True
+"""Cython interface to xxHash C code by Y. Collet
+
+xxHash is an extremely fast non-cryptographic hash function.
+https://github.com/Cyan4973/xxHash
+
+For probabilistic data structures the XXH3 family is used. It is
+the fastest variant of the algorithm for short keys, and it provides
+64-bit and 128-bit hash values.
+"""
+from libc.stdint cimport uint64_t
+
+from libc.limits cimport INT_MIN, INT_MAX
+
+from cpython.bytes cimport PyBytes_AS_STRING, PyBytes_GET_SIZE
+
+from pdsa.helpers.hashing.pylong cimport as_long_long
+
+cdef extern from *:
+    """
+    #define XXH_INLINE_ALL
+    #include "xxhash.h"
+    """
+    ctypedef struct XXH128_hash_t:
+        uint64_t low64
+        uint64_t high64
+
+    uint64_t XXH3_64bits_withSeed(const void* data, size_t len, uint64_t seed) nogil
+    XXH128_hash_t XXH3_128bits_withSeed(const void* data, size_t len, uint64_t seed) nogil
+
+
+cdef uint64_t xxh3_64bit_bytes(bytes key, uint64_t seed=42):
+    return XXH3_64bits_withSeed(
+        PyBytes_AS_STRING(key), PyBytes_GET_SIZE(key), seed)
+
+cdef uint64_t xxh3_64bit_int(long long key, uint64_t seed=42):
+    cdef int short_key
+    if INT_MIN <= key <= INT_MAX:
+        short_key = <int>key
+        return XXH3_64bits_withSeed(&short_key, sizeof(short_key), seed)
+    return XXH3_64bits_withSeed(&key, sizeof(key), seed)
+
+
+cpdef uint64_t xxh3_64bit(object key, uint64_t seed=42):
+    """Compute XXH3 64bit hash value.
+
+    Parameters
+    ----------
+    key : obj
+        The object to compute the hash value from.
+    seed : :obj:`int`
+        The seed to support reproducable hash calculation.
+
+    """
+    if isinstance(key, bytes):
+        return xxh3_64bit_bytes(key, seed)
+
+    cdef long long value
+    if isinstance(key, int) and as_long_long(key, &value):
+        return xxh3_64bit_int(value, seed)
+
+    return xxh3_64bit_bytes(repr(key).encode("utf-8"), seed)
+
+
+cdef void xxh3_128bit_bytes(bytes key, uint64_t seed, uint64_t* out):
+    cdef XXH128_hash_t hash_value = XXH3_128bits_withSeed(
+        PyBytes_AS_STRING(key), PyBytes_GET_SIZE(key), seed)
+    out[0] = hash_value.low64
+    out[1] = hash_value.high64
+
+cdef void xxh3_128bit_int(long long key, uint64_t seed, uint64_t* out):
+    cdef XXH128_hash_t hash_value
+    cdef int short_key
+    if INT_MIN <= key <= INT_MAX:
+        short_key = <int>key
+        hash_value = XXH3_128bits_withSeed(
+            &short_key, sizeof(short_key), seed)
+    else:
+        hash_value = XXH3_128bits_withSeed(&key, sizeof(key), seed)
+    out[0] = hash_value.low64
+    out[1] = hash_value.high64
+
+
+cdef void xxh3_128bit_pair(object key, uint64_t seed, uint64_t* out) except *:
+    """Compute XXH3 128bit hash value into two 64-bit halves.
+
+    Parameters
+    ----------
+    key : obj
+        The object to compute the hash value from.
+    seed : :obj:`int`
+        The seed to support reproducable hash calculation.
+    out : uint64_t*
+        The buffer of two 64-bit words that receives the hash value.
+
+    """
+    cdef long long value
+    if isinstance(key, bytes):
+        xxh3_128bit_bytes(key, seed, out)
+    elif isinstance(key, int) and as_long_long(key, &value):
+        xxh3_128bit_int(value, seed, out)
+    else:
+        xxh3_128bit_bytes(repr(key).encode("utf-8"), seed, out)
+
+
+cpdef tuple xxh3_128bit(object key, uint64_t seed=42):
+    """Compute XXH3 128bit hash value.
+
+    Parameters
+    ----------
+    key : obj
+        The object to compute the hash value from.
+    seed : :obj:`int`
+        The seed to support reproducable hash calculation.
+
+    Returns
+    -------
+    :obj:`tuple`
+        The pair of 64-bit halves (low, high) of the hash value.
+
+    """
+    cdef uint64_t out[2]
+    xxh3_128bit_pair(key, seed, out)
+    return out[0], out[1]
@@ -5,11 +5,11 @@ cdef extern from "src/BitField.h":
    cdef cppclass BitField:
         uint8_t field
 
-        void clear()
-        uint8_t count()
+        void clear() nogil
+        uint8_t count() nogil
 
-        void set_bit(uint8_t bit_number, bint flag)
-        bint get_bit(uint8_t bit_number)
+        void set_bit(uint8_t bit_number, bint flag) nogil
+        bint get_bit(uint8_t bit_number) nogil
 
 
 cdef class BitVector:
@@ -20,3 +20,6 @@ cdef class BitVector:
 
     cpdef size_t count(self)
     cpdef size_t sizeof(self)
+
+    cdef bint _get_bit(self, const size_t index) nogil
+    cdef void _set_bit(self, const size_t index, const bint flag) nogil
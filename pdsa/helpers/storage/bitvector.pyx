@@ -1,3 +1,4 @@
+# cython: binding=False, infer_types=True
 """BitVector.
 
 BitVector is an array of C++ BitFields (8 bits long) that
@@ -7,8 +8,12 @@ supports flatten navigation.
 import cython
 
 from libc.math cimport ceil
+from libc.stdint cimport uint64_t
+from libc.string cimport memcpy
 from cpython.mem cimport PyMem_Malloc, PyMem_Free
 
+from pdsa.helpers.storage.popcount cimport pdsa_popcount64
+
 
 cdef uint8_t BITFIELD_BITSIZE = sizeof(BitField) * 8
 
@@ -132,11 +137,37 @@ cdef class BitVector:
         bucket, bit = divmod(index, BITFIELD_BITSIZE)
         self.vector[bucket].set_bit(bit, flag)
 
+    @cython.cdivision(True)
+    cdef bint _get_bit(self, const size_t index) nogil:
+        """Get element (bit value) by the index without range checks.
+
+        Note
+        ----
+            It's a C-level counterpart of `__getitem__` for the callers
+            that have already guaranteed that `index` is in range.
+
+        """
+        return self.vector[index // BITFIELD_BITSIZE].get_bit(
+            index % BITFIELD_BITSIZE)
+
+    @cython.cdivision(True)
+    cdef void _set_bit(self, const size_t index, const bint flag) nogil:
+        """Set element (bit value) by the index without range checks.
+
+        Note
+        ----
+            It's a C-level counterpart of `__setitem__` for the callers
+            that have already guaranteed that `index` is in range.
+
+        """
+        self.vector[index // BITFIELD_BITSIZE].set_bit(
+            index % BITFIELD_BITSIZE, flag)
+
     def __dealloc__(self):
         PyMem_Free(self.vector)
 
     def __repr__(self):
-        return "<BitVector (size: {}, length: {})>".format(
+        return "<BitVector (size: %d, length: %d)>" % (
             self.size,
             self.length
         )
@@ -174,10 +205,20 @@ cdef class BitVector:
             Number of set bits in the vector.
 
         """
+        cdef const uint8_t* data = <const uint8_t*>self.vector
+        cdef size_t num_of_words = self.size // sizeof(uint64_t)
         cdef size_t num_of_bits = 0
+        cdef uint64_t word
+
+        # BitFields are single bytes, so the vector is counted by
+        # 64-bit words (a popcnt instruction each), with a byte tail.
+        cdef size_t index
+        for index in range(num_of_words):
+            memcpy(&word, data + index * sizeof(uint64_t), sizeof(uint64_t))
+            num_of_bits += pdsa_popcount64(word)
 
         cdef size_t bucket
-        for bucket in range(self.size):
+        for bucket in range(num_of_words * sizeof(uint64_t), self.size):
             num_of_bits += self.vector[bucket].count()
 
         return num_of_bits
@@ -5,12 +5,12 @@ cdef extern from "src/BitCounter.h":
    cdef cppclass BitCounter:
         uint8_t counter
 
-        void reset()
+        void reset() nogil
 
-        void reset(uint8_t counter_number)
-        void inc(uint8_t counter_number)
-        void dec(uint8_t counter_number)
-        uint8_t value(uint8_t counter_number)
+        void reset(uint8_t counter_number) nogil
+        void inc(uint8_t counter_number) nogil
+        void dec(uint8_t counter_number) nogil
+        uint8_t value(uint8_t counter_number) nogil
 
 
 cdef class BitVectorCounter:
@@ -19,4 +19,10 @@ cdef class BitVectorCounter:
 
     cdef BitCounter * vector
 
+    cpdef void increment_many(self, object indices) except *
+    cpdef size_t count(self)
     cpdef size_t sizeof(self)
+
+    cdef void _increment(self, const size_t index) nogil
+    cdef void _decrement(self, const size_t index) nogil
+    cdef uint8_t _value(self, const size_t index) nogil
@@ -1,3 +1,4 @@
+# cython: binding=False, infer_types=True
 """BitVectorCounter.
 
 BitVectorCounter is an array of C++ BitCounters (8 bits long, encoded
@@ -7,10 +8,18 @@ two 4-bits counters) that supports flatten navigation.
 import cython
 
 from libc.math cimport ceil
+from libc.stdint cimport uint64_t
+from libc.string cimport memcpy
 from cpython.mem cimport PyMem_Malloc, PyMem_Free
 
+from pdsa.helpers.storage.popcount cimport pdsa_popcount64
+
+
 cdef uint8_t NUMBER_OF_SUBCOUNTERS = 2
 
+# The lowest bit of every 4-bit counter in a 64-bit word.
+cdef uint64_t LOWEST_BITS_MASK = 0x1111111111111111
+
 
 cdef class BitVectorCounter:
     """Implementation of a vector of 4-bits counters.
@@ -103,6 +112,72 @@ cdef class BitVectorCounter:
         self.vector[bucket].inc(counter_number)
 
 
+    cpdef void increment_many(self, object indices) except *:
+        """Increment counters' values by all indices from the iterable.
+
+        Parameters
+        ----------
+        indices : iterable
+            The indices of the counters in the vector.
+
+        Raises
+        ------
+        IndexError
+            If any index is out of range.
+
+        Note
+        ----
+            A counter whose index occurs several times is incremented
+            several times.
+
+        """
+        cdef size_t index
+        for index in indices:
+            if index >= self.length:
+                raise IndexError("Index {} out of range".format(index))
+            self._increment(index)
+
+    @cython.cdivision(True)
+    cdef void _increment(self, const size_t index) nogil:
+        """Increment counter's value by the index without range checks.
+
+        Note
+        ----
+            It's a C-level counterpart of `increment()` for the callers
+            that have already guaranteed that `index` is in range.
+
+        """
+        self.vector[index // NUMBER_OF_SUBCOUNTERS].inc(
+            index % NUMBER_OF_SUBCOUNTERS)
+
+
+    @cython.cdivision(True)
+    cdef void _decrement(self, const size_t index) nogil:
+        """Decrement counter's value by the index without range checks.
+
+        Note
+        ----
+            It's a C-level counterpart of `decrement()` for the callers
+            that have already guaranteed that `index` is in range.
+
+        """
+        self.vector[index // NUMBER_OF_SUBCOUNTERS].dec(
+            index % NUMBER_OF_SUBCOUNTERS)
+
+    @cython.cdivision(True)
+    cdef uint8_t _value(self, const size_t index) nogil:
+        """Get counter's value by the index without range checks.
+
+        Note
+        ----
+            It's a C-level counterpart of `__getitem__` for the callers
+            that have already guaranteed that `index` is in range.
+
+        """
+        return self.vector[index // NUMBER_OF_SUBCOUNTERS].value(
+            index % NUMBER_OF_SUBCOUNTERS)
+
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     @cython.cdivision(True)
@@ -166,7 +241,7 @@ cdef class BitVectorCounter:
         PyMem_Free(self.vector)
 
     def __repr__(self):
-        return "<BitVectorCounter (size: {}, length: {})>".format(
+        return "<BitVectorCounter (size: %d, length: %d)>" % (
             self.size,
             self.length
         )
@@ -182,6 +257,42 @@ cdef class BitVectorCounter:
         """
         return self.length
 
+    cpdef size_t count(self):
+        """Count number of non-zero counters in the vector.
+
+        Returns
+        -------
+        :obj:`int`
+            Number of counters with a value bigger than 0.
+
+        Note
+        ----
+            The vector is processed by 64-bit words of 16 counters.
+            Every counter is folded into its lowest bit, that is set
+            if any of its 4 bits is set, and the folded bits are
+            counted with a single popcount per word.
+
+        """
+        cdef const uint8_t* data = <const uint8_t*>self.vector
+        cdef size_t num_of_words = self.size // sizeof(uint64_t)
+        cdef size_t num_of_counters = 0
+        cdef uint64_t word
+
+        cdef size_t index
+        for index in range(num_of_words):
+            memcpy(&word, data + index * sizeof(uint64_t), sizeof(uint64_t))
+            word |= word >> 1
+            word |= word >> 2
+            num_of_counters += pdsa_popcount64(word & LOWEST_BITS_MASK)
+
+        cdef size_t bucket
+        for bucket in range(num_of_words * sizeof(uint64_t), self.size):
+            num_of_counters += (
+                (self.vector[bucket].value(0) != 0) +
+                (self.vector[bucket].value(1) != 0))
+
+        return num_of_counters
+
     cpdef size_t sizeof(self):
         """Size of the vector in bytes.
 
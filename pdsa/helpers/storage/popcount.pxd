@@ -0,0 +1,15 @@
+from libc.stdint cimport uint64_t
+
+
+cdef extern from *:
+    """
+    #if defined(_MSC_VER)
+    #include <intrin.h>
+    #define pdsa_popcount64(value) ((int)__popcnt64(value))
+    #else
+    #define pdsa_popcount64(value) __builtin_popcountll(value)
+    #endif
+    """
+    # Count set bits in a 64-bit word with a single popcnt instruction
+    # where the target supports it.
+    int pdsa_popcount64(uint64_t value) nogil
@@ -1,6 +1,4 @@
-from libc.stdint cimport uint32_t, uint8_t
-
-from pdsa.helpers.storage.bitvector cimport BitVector
+from libc.stdint cimport uint64_t, uint32_t, uint8_t
 
 cdef class BloomFilter:
     cdef size_t length
@@ -9,12 +7,18 @@ cdef class BloomFilter:
     cdef size_t capacity
     cdef float error_rate
 
-    cdef uint8_t[:] _seeds
-    cdef BitVector _table
+    cdef size_t _size
+    cdef void* _buffer
+    cdef uint8_t* _table
 
     cpdef void add(self, object element) except *
+    cpdef void add_many(self, object elements) except *
     cpdef bint test(self, object element) except *
     cpdef size_t count(self)
     cpdef size_t sizeof(self)
 
-    cdef uint32_t _hash(self, object element, uint8_t seed)
+    cdef void _hash(self, object element, uint64_t* out) except *
+    cdef size_t _block_offset(self, const uint64_t* hash_value,
+                              size_t* block_length) nogil
+    cdef bint _get_bit(self, const size_t index) nogil
+    cdef void _set_bit(self, const size_t index) nogil
@@ -1,3 +1,4 @@
+# cython: binding=False, infer_types=True
 """
 Bloom Filter.
 
@@ -24,12 +25,25 @@ References
 """
 import cython
 
-from libc.math cimport ceil, log, round
-from libc.stdint cimport uint32_t, uint8_t
+from libc.math cimport floor, log, round
+from libc.stdint cimport uint64_t, uint32_t, uint8_t, uintptr_t
+from libc.stdlib cimport calloc, free
+from libc.string cimport memcpy
 
-from cpython.array cimport array
+from pdsa.helpers.hashing.fastrange cimport pdsa_fastrange64
+from pdsa.helpers.hashing.xxh cimport xxh3_128bit_pair
+from pdsa.helpers.storage.popcount cimport pdsa_popcount64
 
-from pdsa.helpers.hashing.mmh cimport mmh3_x86_32bit
+
+# The bits of every element are set inside a single block of 512 bits,
+# that is the size of a common 64-byte cache line. The table is aligned
+# to the block size, so every block occupies exactly one cache line.
+DEF BLOCK_BITSIZE = 512
+DEF BLOCK_BYTESIZE = BLOCK_BITSIZE // 8
+
+# The seed of the single XXH3 hash, whose halves choose the block
+# of an element and the bits inside that block.
+cdef uint64_t HASH_SEED = 0
 
 cdef class BloomFilter:
     """Bloom filter is a realisation of a probabilistic set.
@@ -51,8 +65,11 @@ cdef class BloomFilter:
 
     Note
     -----
-        This implementation uses MurmurHash3 family of hash functions
-        which yields a 32-bit hash value.
+        This implementation uses XXH3 hash function
+        which yields a 128-bit hash value. Its high half selects
+        a block of 512 bits and the low half generates the positions
+        of all `num_of_hashes` bits inside that block, so each
+        operation touches a single cache line (blocked Bloom filter).
 
     Attributes
     ----------
@@ -75,9 +92,9 @@ cdef class BloomFilter:
 
         Note
         ----
-            Memory for the internal array is allocated by blocks
-            (or chunks), therefore the final `length` of the filter
-            can be bigger to use whole allocated space efficiently.
+            Memory for the internal array is allocated by bytes,
+            therefore the final `length` of the filter can be rounded
+            up to a multiple of 8 to use whole allocated space efficiently.
 
         Raises
         ------
@@ -94,15 +111,16 @@ cdef class BloomFilter:
 
         self.num_of_hashes = num_of_hashes
 
-        self._seeds = array('B', range(self.num_of_hashes))
-        self._table = BitVector(length)
+        self.length = length + (-length & 7)
+        self._size = self.length >> 3
 
-        self.length = len(self._table)
-
-        cdef size_t index
-        for index in xrange(self.length):
-            self._table[index] = 0
+        self._buffer = calloc(self._size + BLOCK_BYTESIZE - 1, 1)
+        if not self._buffer:
+            raise MemoryError()
 
+        self._table = <uint8_t*>(
+            (<uintptr_t>self._buffer + BLOCK_BYTESIZE - 1) &
+            ~(<uintptr_t>BLOCK_BYTESIZE - 1))
 
     @classmethod
     def create_from_capacity(cls, const size_t capacity, const float error):
@@ -134,17 +152,61 @@ cdef class BloomFilter:
         if error <= 0 or error >= 1:
             raise ValueError("Error rate shell be in (0, 1)")
 
-        cdef size_t length = - <size_t>(capacity * log(error) / (log(2) ** 2))
-        cdef uint8_t num_of_hashes = - <uint8_t>(ceil(log(error) / log(2)))
+        cdef size_t length = <size_t>(capacity * (- log(error)) / (log(2) ** 2))
+        cdef uint8_t num_of_hashes = <uint8_t>(floor(- log(error) / log(2)))
 
         return cls(length, max(1, num_of_hashes))
 
-    cdef uint32_t _hash(self, object key, uint8_t seed):
-        # self.algorithm = "mmh3_x86_32bit"
-        return mmh3_x86_32bit(key, seed)
+    @cython.final
+    cdef void _hash(self, object key, uint64_t* out) except *:
+        xxh3_128bit_pair(key, HASH_SEED, out)
+
+    @cython.final
+    @cython.cdivision(True)
+    cdef size_t _block_offset(self, const uint64_t* hash_value,
+                              size_t* block_length) nogil:
+        """Find the block of the filter that indexes the hash value.
+
+        Parameters
+        ----------
+        hash_value : uint64_t*
+            The 128-bit hash value as two 64-bit halves (low, high).
+        block_length : size_t*
+            The variable that receives the number of bits in the block.
+
+        Returns
+        -------
+        :obj:`int`
+            The index of the first bit of the block.
+
+        Note
+        ----
+            All blocks are `BLOCK_BITSIZE` bits long, except the last
+            one that gets the rest of the filter if its length
+            isn't a multiple of the block size. The block is chosen
+            by a bit of the filter, so the shorter last block gets
+            proportionally fewer elements.
+
+        """
+        cdef size_t offset = pdsa_fastrange64(
+            hash_value[1], self.length) & ~(BLOCK_BITSIZE - 1)
+        block_length[0] = self.length - offset
+        if block_length[0] > BLOCK_BITSIZE:
+            block_length[0] = BLOCK_BITSIZE
+        return offset
+
+    @cython.final
+    cdef bint _get_bit(self, const size_t index) nogil:
+        """Get the bit of the table by its index without range checks."""
+        return (self._table[index >> 3] >> (index & 7)) & 1
+
+    @cython.final
+    cdef void _set_bit(self, const size_t index) nogil:
+        """Set the bit of the table by its index without range checks."""
+        self._table[index >> 3] |= 1 << (index & 7)
 
     def __dealloc__(self):
-        pass
+        free(self._buffer)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -158,13 +220,37 @@ cdef class BloomFilter:
             The element to be added into the filter.
 
         """
-        cdef uint8_t seed_index
-        cdef uint8_t seed
-        cdef size_t index
-        for seed_index in range(self.num_of_hashes):
-            seed = self._seeds[seed_index]
-            index = self._hash(element, seed) % self.length
-            self._table[index] = 1
+        cdef uint64_t hash_value[2]
+        self._hash(element, hash_value)
+
+        cdef size_t block_length
+        cdef size_t offset = self._block_offset(hash_value, &block_length)
+
+        # Double hashing with an odd step, so the bits are distinct
+        # inside a full block.
+        cdef uint64_t position = hash_value[0]
+        cdef uint64_t step = (hash_value[0] >> 32) | 1
+        cdef uint8_t hash_index
+
+        for hash_index in range(self.num_of_hashes):
+            self._set_bit(offset + (
+                position & (BLOCK_BITSIZE - 1)
+                if block_length == BLOCK_BITSIZE
+                else position % block_length))
+            position += step
+
+    cpdef void add_many(self, object elements) except *:
+        """Add all elements from the iterable into the filter.
+
+        Parameters
+        ----------
+        elements : iterable
+            The elements to be added into the filter.
+
+        """
+        cdef object element
+        for element in elements:
+            self.add(element)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -188,14 +274,22 @@ cdef class BloomFilter:
             it has some false positive rate.
 
         """
-        cdef uint8_t seed_index
-        cdef uint8_t seed
-        cdef size_t index
-        for seed_index in range(self.num_of_hashes):
-            seed = self._seeds[seed_index]
-            index = self._hash(element, seed) % self.length
-            if self._table[index] != 1:
+        cdef uint64_t hash_value[2]
+        self._hash(element, hash_value)
+
+        cdef size_t block_length
+        cdef size_t offset = self._block_offset(hash_value, &block_length)
+
+        cdef uint64_t position = hash_value[0]
+        cdef uint64_t step = (hash_value[0] >> 32) | 1
+        cdef uint8_t hash_index
+        for hash_index in range(self.num_of_hashes):
+            if not self._get_bit(offset + (
+                    position & (BLOCK_BITSIZE - 1)
+                    if block_length == BLOCK_BITSIZE
+                    else position % block_length)):
                 return False
+            position += step
         return True
 
     cpdef size_t sizeof(self):
@@ -207,13 +301,17 @@ cdef class BloomFilter:
             Number of bytes allocated for the filter.
 
         """
-        return self._table.sizeof()
+        return self._size
+
+    def __sizeof__(self):
+        """Size of the filter object in bytes, including its storage."""
+        return object.__sizeof__(self) + self.sizeof()
 
     def __contains__(self, object element):
         return self.test(element)
 
     def __repr__(self):
-        return "<BloomFilter (length: {}, hashes: {})>".format(
+        return "<BloomFilter (length: %d, hashes: %d)>" % (
             self.length,
             self.num_of_hashes
         )
@@ -254,7 +352,17 @@ cdef class BloomFilter:
             Journal of Chemical Information and Modeling, 47(3): 952-964, 2007.
 
         """
-        cdef size_t num_of_bits = self._table.count()
+        cdef size_t num_of_words = self._size // sizeof(uint64_t)
+        cdef size_t num_of_bits = 0
+        cdef uint64_t word
+
+        cdef size_t index
+        for index in range(num_of_words):
+            memcpy(&word, self._table + index * sizeof(uint64_t), sizeof(uint64_t))
+            num_of_bits += pdsa_popcount64(word)
+
+        for index in range(num_of_words * sizeof(uint64_t), self._size):
+            num_of_bits += pdsa_popcount64(self._table[index])
 
         if num_of_bits < self.num_of_hashes:
             return 0
@@ -1,14 +1,24 @@
+# cython: binding=False, infer_types=True
 """Counting Bloom Filter."""
 import cython
 
-from libc.math cimport ceil, log, round
-from libc.stdint cimport uint32_t, uint8_t
+from libc.math cimport floor, log, round
+from libc.stdint cimport uint64_t, uint8_t
 
-from cpython.array cimport array
 from cpython.ref cimport PyObject
 from cpython.mem cimport PyMem_Malloc, PyMem_Free
 
-from pdsa.helpers.hashing.mmh cimport mmh3_x86_32bit
+from pdsa.helpers.hashing.fastrange cimport pdsa_fastrange64
+from pdsa.helpers.hashing.xxh cimport xxh3_128bit_pair
+
+
+# The seed of the single XXH3 hash, from which all counter positions
+# of an element are derived by double hashing.
+cdef uint64_t HASH_SEED = 0
+
+# The number of hash functions is stored as uint8_t, so indices
+# of all hash functions always fit into a fixed stack buffer.
+DEF MAX_NUM_OF_HASHES = 256
 
 cdef class CountingBloomFilter:
     """Counting filter is a realisation of a probabilistic set.
@@ -32,8 +42,11 @@ cdef class CountingBloomFilter:
 
     Note
     -----
-        This implementation uses MurmurHash3 family of hash functions
-        which yields a 32-bit hash value.
+        This implementation uses XXH3 hash function
+        which yields a 128-bit hash value.
+        Both 64-bit halves h1 and h2 of a single hash value generate
+        indices for all `num_of_hashes` hash functions as h1 + i * h2
+        (Kirsch-Mitzenmacher double hashing).
 
     Note
     -----
@@ -79,16 +92,9 @@ cdef class CountingBloomFilter:
 
         self.num_of_hashes = num_of_hashes
 
-        self._seeds = array('B', range(self.num_of_hashes))
-        self._table = BitVector(length)
-
-        self.length = len(self._table)
+        self._counter = BitVectorCounter(length)
 
-        self._counter = BitVectorCounter(self.length)
-
-        cdef size_t index
-        for index in xrange(self.length):
-            self._table[index] = 0
+        self.length = len(self._counter)
 
 
     @classmethod
@@ -121,14 +127,49 @@ cdef class CountingBloomFilter:
         if error <= 0 or error >= 1:
             raise ValueError("Error rate shell be in (0, 1)")
 
-        cdef size_t length = - <size_t>(capacity * log(error) / (log(2) ** 2))
-        cdef uint8_t num_of_hashes = - <uint8_t>(ceil(log(error) / log(2)))
+        cdef size_t length = <size_t>(capacity * (- log(error)) / (log(2) ** 2))
+        cdef uint8_t num_of_hashes = <uint8_t>(floor(- log(error) / log(2)))
 
         return cls(length, max(1, num_of_hashes))
 
-    cdef uint32_t _hash(self, object key, uint8_t seed):
-        # self.algorithm = "mmh3_x86_32bit"
-        return mmh3_x86_32bit(key, seed)
+    @cython.final
+    cdef void _hash(self, object key, uint64_t* out) except *:
+        xxh3_128bit_pair(key, HASH_SEED, out)
+
+    @cython.final
+    @cython.cdivision(True)
+    cdef void _indices(self, object key, size_t* indices) except *:
+        """Compute indices of all hash functions for the key.
+
+        Parameters
+        ----------
+        key : obj
+            The element to compute indices for.
+        indices : size_t*
+            The buffer of `num_of_hashes` elements that receives indices.
+
+        Note
+        ----
+            Only one hash value is computed per element, the i-th index
+            is (h1 + i * h2) mapped into the filter's length [1]. The
+            mapping is a multiplication and a shift instead of the
+            modulo, that avoids a 64-bit division per hash function.
+
+        References
+        ----------
+        [1] A. Kirsch, M. Mitzenmacher
+            Less Hashing, Same Performance: Building a Better Bloom Filter.
+            Random Structures & Algorithms, Vol. 33 (2), 187-218, 2008
+
+        """
+        cdef uint64_t hash_value[2]
+        self._hash(key, hash_value)
+
+        cdef uint64_t position = hash_value[0]
+        cdef uint8_t hash_index
+        for hash_index in range(self.num_of_hashes):
+            indices[hash_index] = pdsa_fastrange64(position, self.length)
+            position += hash_value[1]
 
     def __dealloc__(self):
         pass
@@ -145,14 +186,25 @@ cdef class CountingBloomFilter:
             The element to be added into the filter.
 
         """
-        cdef uint8_t seed_index
-        cdef uint8_t seed
-        cdef size_t index
-        for seed_index in range(self.num_of_hashes):
-            seed = self._seeds[seed_index]
-            index = self._hash(element, seed) % self.length
-            self._table[index] = 1
-            self._counter.increment(index)
+        cdef size_t indices[MAX_NUM_OF_HASHES]
+        self._indices(element, indices)
+
+        cdef uint8_t hash_index
+        for hash_index in range(self.num_of_hashes):
+            self._counter._increment(indices[hash_index])
+
+    cpdef void add_many(self, object elements) except *:
+        """Add all elements from the iterable into the filter.
+
+        Parameters
+        ----------
+        elements : iterable
+            The elements to be added into the filter.
+
+        """
+        cdef object element
+        for element in elements:
+            self.add(element)
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -175,15 +227,20 @@ cdef class CountingBloomFilter:
             Due to the probabilistic nature of the Bloom filter,
             it has some false positive rate.
 
+            Indices are computed one at a time and the lookup stops
+            at the first zero counter, so most negative lookups probe
+            only a few counters.
+
         """
-        cdef uint8_t seed_index
-        cdef uint8_t seed
-        cdef size_t index
-        for seed_index in range(self.num_of_hashes):
-            seed = self._seeds[seed_index]
-            index = self._hash(element, seed) % self.length
-            if self._table[index] != 1:
+        cdef uint64_t hash_value[2]
+        self._hash(element, hash_value)
+
+        cdef uint64_t position = hash_value[0]
+        cdef uint8_t hash_index
+        for hash_index in range(self.num_of_hashes):
+            if self._counter._value(pdsa_fastrange64(position, self.length)) == 0:
                 return False
+            position += hash_value[1]
         return True
 
     @cython.boundscheck(False)
@@ -209,22 +266,16 @@ cdef class CountingBloomFilter:
             is only probabilistically correct.
 
         """
-        cdef uint8_t seed_index
-        cdef uint8_t seed
-        cdef array indices = array('Q', [0] * self.num_of_hashes)
-        for seed_index in range(self.num_of_hashes):
-            seed = self._seeds[seed_index]
-            indices[seed_index] = self._hash(element, seed) % self.length
-
-        cdef size_t index
-        for index in indices:
-            if self._table[index] != 1:
+        cdef size_t indices[MAX_NUM_OF_HASHES]
+        self._indices(element, indices)
+
+        cdef uint8_t hash_index
+        for hash_index in range(self.num_of_hashes):
+            if self._counter._value(indices[hash_index]) == 0:
                 return False
 
-        for index in indices:
-            self._counter.decrement(index)
-            if self._counter[index] == 0:
-               self._table[index] = 0
+        for hash_index in range(self.num_of_hashes):
+            self._counter._decrement(indices[hash_index])
         return True
 
     cpdef size_t sizeof(self):
@@ -236,13 +287,17 @@ cdef class CountingBloomFilter:
             Number of bytes allocated for the filter.
 
         """
-        return self._table.sizeof() + self._counter.sizeof()
+        return self._counter.sizeof()
+
+    def __sizeof__(self):
+        """Size of the filter object in bytes, including its storage."""
+        return object.__sizeof__(self) + self.sizeof()
 
     def __contains__(self, object element):
         return self.test(element)
 
     def __repr__(self):
-        return "<CountingBloomFilter (length: {}, hashes: {})>".format(
+        return "<CountingBloomFilter (length: %d, hashes: %d)>" % (
             self.length,
             self.num_of_hashes
         )
@@ -283,7 +338,8 @@ cdef class CountingBloomFilter:
             Journal of Chemical Information and Modeling, 47(3): 952-964, 2007.
 
         """
-        cdef size_t num_of_bits = self._table.count()
+        # A bit of the classical filter is set iff its counter is non-zero.
+        cdef size_t num_of_bits = self._counter.count()
 
         if num_of_bits < self.num_of_hashes:
             return 0
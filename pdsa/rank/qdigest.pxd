@@ -16,6 +16,7 @@ cdef class QuantileDigest:
     cdef dict _qdigest
 
     cpdef void add(self, uint32_t element, bint compress=*) except *
+    cpdef void add_many(self, object elements, bint compress=*) except *
     cpdef void compress(self)
 
     cpdef uint32_t quantile_query(self, float quantile) except *
@@ -33,7 +34,8 @@ cdef class QuantileDigest:
     cdef uint8_t _bucket_level(self, uint64_t bucket_id)
     cdef tuple _bucket_range(self, uint64_t bucket_id)
 
-    cdef list _buckets_on_level(self, uint8_t level)
-    cdef bint _merge_if_needed(self, uint64_t bucket_id)
+    cdef list _buckets_by_level(self)
+    cdef bint _merge_if_needed(self, uint64_t bucket_id, size_t boundary_value)
     cdef bint _delete_bucket_if_exists(self, uint64_t bucket_id) except *
-    cdef bint _is_worth_to_store(self, size_t counts_sum)
+    cdef size_t _boundary_value(self)
+    cdef bint _is_worth_to_store(self, size_t counts_sum, size_t boundary_value)
@@ -1,3 +1,4 @@
+# cython: binding=False, infer_types=True
 """
 
 Quantile Digest.
@@ -23,6 +24,27 @@ from libc.math cimport ceil, floor, log, round
 from libc.stdint cimport uint64_t, uint32_t, uint8_t, UINT32_MAX
 from libc.stdlib cimport rand
 
+
+cdef extern from *:
+    """
+    #if defined(_MSC_VER)
+    #include <intrin.h>
+    static inline int pdsa_bit_length64(uint64_t value) {
+        unsigned long index;
+        if (!_BitScanReverse64(&index, value)) {
+            return 0;
+        }
+        return (int)index + 1;
+    }
+    #else
+    static inline int pdsa_bit_length64(uint64_t value) {
+        return value ? 64 - __builtin_clzll(value) : 0;
+    }
+    #endif
+    """
+    int pdsa_bit_length64(uint64_t value) nogil
+
+
 cdef uint8_t ROOT_BUCKET = 1
 
 
@@ -187,19 +209,15 @@ cdef class QuantileDigest:
 
         return 2 * parent_bucket_id + current_bucket_shift ^ 1
 
-    cdef list _buckets_on_level(self, uint8_t level):
-        """Get all buckets from q-digest that exist on the level `level`.
-
-        Parameters
-        ----------
-        level : :obj:`int`
-            The `level` index.
+    cdef list _buckets_by_level(self):
+        """Group all buckets from q-digest by the level they are located on.
 
         Returns
         -------
         list
-            List of bucket IDs from level `level` that are included in
-            q-digest data structure.
+            List of `self._tree_height + 1` lists, where the `k`-th list
+            contains bucket IDs from level `k` that are included in
+            q-digest data structure (the 0-th list is always empty).
 
         Note
         ----
@@ -207,19 +225,15 @@ cdef class QuantileDigest:
             partition, the buckets from level `k` have
             indices 2^{k-1} .. 2^{k} - 1.
 
-        """
-        cdef uint64_t bucket_ids_start = <uint64_t>1 << (level - 1)
-        cdef uint64_t bucket_ids_end = 2 * bucket_ids_start - 1
-
-        # NOTE: We iterate over q-digest (instead of the tree) since
-        # it has fewer buckets than the average level of a full tree.
-        # TODO: Does it make sense to iterate over all possible buckets'
-        # ids if the level is small (e.g., if layer < 5)?
+            The q-digest is scanned only once, instead of once per level
+            of the tree, which matters for wide ranges where the tree
+            has many levels (up to 33).
 
-        cdef list buckets = []
+        """
+        cdef list buckets = [[] for _ in range(self._tree_height + 1)]
+        cdef uint64_t bucket_id
         for bucket_id in self._qdigest:
-            if bucket_ids_start <= bucket_id <= bucket_ids_end:
-                buckets.append(bucket_id)
+            (<list>buckets[self._bucket_level(bucket_id)]).append(bucket_id)
         return buckets
 
     cdef uint8_t _bucket_level(self, uint64_t bucket_id):
@@ -236,7 +250,7 @@ cdef class QuantileDigest:
             partition, the buckets from level `k` have
             indices 2^{k-1} .. 2^{k} - 1. Thus, finding the closest
             power of 2 bigger than the bucket ID give us the bucket's
-            level.
+            level, that is the number of significant bits in the ID.
 
         Returns
         -------
@@ -244,7 +258,7 @@ cdef class QuantileDigest:
             The level of the binary tree where the bucket is located.
 
         """
-        return bucket_id.bit_length()
+        return pdsa_bit_length64(bucket_id)
 
     @cython.cdivision(True)
     cdef tuple _bucket_range(self, uint64_t bucket_id):
@@ -345,7 +359,58 @@ cdef class QuantileDigest:
         if compress:
             self.compress()
 
-    cdef bint _is_worth_to_store(self, size_t family_counts):
+    cpdef void add_many(self, object elements, bint compress=False) except *:
+        """Add all elements from the iterable into the q-digest.
+
+        Parameters
+        ----------
+        elements : iterable
+            The input elements.
+        compress : :obj:bint
+            A flag to automatically compress q-digest structure after
+            all elements are added.
+
+        Note
+        ----
+            If requested, the q-digest is compressed only once,
+            after the last element.
+
+        Raises
+        ------
+        ValueError
+            If the value of any element is out of range.
+
+        """
+        cdef uint32_t element
+        for element in elements:
+            self.add(element, False)
+
+        if compress:
+            self.compress()
+
+    cdef size_t _boundary_value(self):
+        """Compute the boundary value for the q-digest property.
+
+        Note
+        ----
+            Boundary value, used to estimate the significance of the counts
+            in the q-digest property, is related to the ratio between
+            the number of elements already in the q-digest and the
+            current compression factor.
+
+            The boundary value doesn't change during the compression,
+            so it's computed only once per `compress()` call.
+
+        Returns
+        -------
+        :obj:`int`
+            The minimal total counts of the family of nodes that are
+            not worth to be stored (at least 1).
+
+        """
+        return max(<size_t>1, <size_t>floor(self._exact_boundary_value))
+
+    cdef bint _is_worth_to_store(self, size_t family_counts, size_t boundary_value):
         """Decide if the family of nodes is worth to be stored.
 
         Parameters
@@ -353,17 +418,14 @@ cdef class QuantileDigest:
         family_counts : :obj:`int`
             The total counts of the family of nodes: the parent and its
             two children.
+        boundary_value : :obj:`int`
+            The boundary value of the q-digest property.
 
         Note
         ----
             If total counts of the family of nodes (parent and 2 children)
             are satisfy the q-digest property, they are worth to be stored.
 
-            Boundary value, used to estimate the significance of the counts
-            in the q-digest property, is related to the ratio between
-            the number of elements already in the q-digest and the
-            current compression factor.
-
         Returns
         -------
         bool
@@ -371,10 +433,6 @@ cdef class QuantileDigest:
             False otherwise.
 
         """
-        cdef size_t boundary_value = max(
-            <uint8_t>1,
-            <size_t>floor(self._exact_boundary_value)
-        )
         return family_counts > boundary_value
 
     def debug(self):
@@ -408,13 +466,15 @@ cdef class QuantileDigest:
         self._number_of_buckets -= 1
         return True
 
-    cdef bint _merge_if_needed(self, uint64_t current_bucket_id):
+    cdef bint _merge_if_needed(self, uint64_t current_bucket_id, size_t boundary_value):
         """Merge family of nodes for the bucket to its parent.
 
         Parameters
         ----------
         current_bucket_id : :obj:`int`
             The bucket whose family if evaluated.
+        boundary_value : :obj:`int`
+            The boundary value of the q-digest property.
 
         Note
         ----
@@ -452,7 +512,7 @@ cdef class QuantileDigest:
             + bucket_parent_counts\
             + bucket_sibling_counts
 
-        if self._is_worth_to_store(family_counts):
+        if self._is_worth_to_store(family_counts, boundary_value):
             return False
 
         if parent_bucket_id not in self._qdigest:
@@ -476,21 +536,31 @@ cdef class QuantileDigest:
         if self._number_of_buckets < 2:
             return
 
-        cdef uint8_t level =  self._tree_height
+        cdef list buckets = self._buckets_by_level()
+        cdef size_t boundary_value = self._boundary_value()
+        cdef uint64_t bucket_id, parent_bucket_id
+        cdef bint is_new_parent
+
+        # NOTE: Families on the same level are disjoint, so the order
+        # of buckets within a level doesn't matter. A parent that was
+        # created by merging has to be evaluated on the next level.
+        cdef uint8_t level = self._tree_height
         while level > 0:
-            buckets = self._buckets_on_level(level)
-            for bucket_id in buckets:
-                self._merge_if_needed(bucket_id)
+            for bucket_id in buckets[level]:
+                parent_bucket_id = self._bucket_parent_id(bucket_id)
+                is_new_parent = parent_bucket_id not in self._qdigest
+                if self._merge_if_needed(bucket_id, boundary_value) and is_new_parent:
+                    (<list>buckets[level - 1]).append(parent_bucket_id)
             level -= 1
 
     def __repr__(self):
         return (
             "<QuantileDigest ("
-            "compression: {}, "
-            "range: [{}, {}], "
-            "length: {}"
+            "compression: %d, "
+            "range: [%d, %d], "
+            "length: %d"
             ")>"
-        ).format(
+        ) % (
             self.compression_factor,
             self._min_range, self._max_range,
             self._number_of_buckets
@@ -542,6 +612,10 @@ cdef class QuantileDigest:
         cdef size_t size_of_bucket = sizeof(uint64_t) + sizeof(size_t)
         return self._number_of_buckets * size_of_bucket
 
+    def __sizeof__(self):
+        """Size of the q-digest object in bytes, including its storage."""
+        return object.__sizeof__(self) + self.sizeof()
+
     @cython.cdivision(True)
     cpdef uint32_t quantile_query(self, float quantile) except *:
         """Execute quantile query to find the quantile element.
@@ -727,11 +801,9 @@ cdef class QuantileDigest:
         if other.range_in_bits != self.range_in_bits:
             raise ValueError("Ranges have to be equal")
 
+        cdef dict qdigest = self._qdigest
         for bucket_id, counts in other._qdigest.items():
-            if bucket_id in self._qdigest:
-                self._qdigest[bucket_id] += counts
-            else:
-                self._qdigest[bucket_id] = counts
+            qdigest[bucket_id] = qdigest.get(bucket_id, 0) + counts
 
         self._number_of_buckets = len(self._qdigest)
         self._exact_boundary_value = float(self.count()) / self.compression_factor
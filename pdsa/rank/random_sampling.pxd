@@ -40,8 +40,10 @@ cdef class RandomSampling:
     cpdef size_t sizeof(self)
     cpdef size_t count(self)
     cpdef void add(self, uint32_t element)
+    cpdef void add_many(self, object elements) except *
 
     cdef uint16_t _active_level(self)
+    cdef uint64_t _autocommit_size(self, const uint16_t level)
     cdef uint8_t _find_empty_buffer(self)
     cdef void _collapse(self)
     cdef void _commit(self, bint force=*)
@@ -1,3 +1,4 @@
+# cython: binding=False, infer_types=True
 """Random Sampling.
 
 The Random sampling algorithm, often referred to as MRL, was
@@ -38,6 +39,7 @@ from random import seed, sample, randint
 from libc.math cimport ceil, floor, log2, sqrt
 from libc.stdint cimport uint64_t, uint32_t, uint16_t, uint8_t
 from libc.stdlib cimport rand
+from libc.string cimport memset
 
 
 cdef class _MetaBuffer:
@@ -99,11 +101,15 @@ cdef class _MetaBuffer:
 
     cdef uint32_t num_of_elements(self, uint8_t buffer_id):
         """Return the number of elements in the corresponding buffer."""
-        cdef uint32_t start_index, end_index
+        cdef uint32_t start_index, end_index, index
+        cdef uint32_t num_of_elements = 0
+        cdef signed char* mask = self._mask.data.as_schars
 
         start_index = self.elements_per_buffer * buffer_id
         end_index = start_index + self.elements_per_buffer
-        return sum(self._mask[start_index:end_index])
+        for index in range(start_index, end_index):
+            num_of_elements += mask[index]
+        return num_of_elements
 
     cdef uint32_t capacity(self, uint8_t buffer_id):
         """Return the available capacity for the corresponding buffer."""
@@ -111,25 +117,22 @@ cdef class _MetaBuffer:
 
     cdef bint is_empty(self, uint8_t buffer_id):
         """Check if the corresponsing buffer is empty."""
-        cdef uint32_t start_index, end_index
-
-        start_index = self.elements_per_buffer * buffer_id
-        end_index = start_index + self.elements_per_buffer
-        return not any(self._mask[start_index:end_index])
+        return self.num_of_elements(buffer_id) == 0
 
     cdef list _retrive_elements(self, uint8_t buffer_id, bint pop=False):
         """Retrive elements from the buffer with/without removal."""
         cdef uint32_t start_index, end_index, index
+        cdef unsigned long* values = self._array.data.as_ulongs
+        cdef signed char* mask = self._mask.data.as_schars
         start_index, end_index = self.location(buffer_id)
 
         cdef list elements = []
-        for index in xrange(start_index, end_index):
-            if not self._mask[index]:
-                continue
+        for index in range(start_index, end_index):
+            if mask[index]:
+                elements.append(values[index])
 
-            elements.append(self._array[index])
-            if pop:
-                self._mask[index] = 0
+        if pop:
+            memset(mask + start_index, 0, end_index - start_index)
 
         return elements
 
@@ -148,15 +151,22 @@ cdef class _MetaBuffer:
             raise ValueError()
 
         cdef uint32_t start_index, end_index, index
+        cdef uint32_t num_of_elements = len(elements)
+        cdef unsigned long* values = self._array.data.as_ulongs
+        cdef signed char* mask = self._mask.data.as_schars
         start_index, end_index = self.location(buffer_id)
-        for index in range(start_index, end_index):
-            try:
-                element = elements.pop()
-            except IndexError:
-                self._mask[index] = 0
-            else:
-                self._array[index] = element
-                self._mask[index] = 1
+
+        # Elements are taken from the tail of the list,
+        # as if they were popped one by one.
+        for index in range(num_of_elements):
+            values[start_index + index] = elements[num_of_elements - 1 - index]
+        memset(mask + start_index, 1, num_of_elements)
+        memset(
+            mask + start_index + num_of_elements,
+            0,
+            end_index - start_index - num_of_elements
+        )
+        del elements[:]
 
 
 cdef class RandomSampling:
@@ -347,6 +357,51 @@ cdef class RandomSampling:
         self._queue.append(element)
         self._commit(force=False)
 
+    cpdef void add_many(self, object elements) except *:
+        """Add all elements from the iterable to the data structure.
+
+        Parameters
+        ----------
+        elements : iterable
+            Elements to add into data structure.
+
+        Note
+        ----
+            Elements are queued directly, and the queue is committed
+            only once it reaches the autocommit size, so the active
+            level is recomputed once per chunk instead of once per
+            element.
+
+        """
+        cdef uint32_t element
+        cdef uint64_t autocommit_size = self._autocommit_size(self._active_level())
+        for element in elements:
+            self._queue.append(element)
+            if <uint64_t>len(self._queue) < autocommit_size:
+                continue
+
+            self._commit(force=False)
+            autocommit_size = self._autocommit_size(self._active_level())
+
+    cdef uint64_t _autocommit_size(self, const uint16_t level):
+        """Calculate the queue size that triggers the commit.
+
+        Parameters
+        ----------
+        level : :obj:`int`
+            The active level number.
+
+        Returns
+        -------
+        :obj:`int`
+            The number of queued elements, which corresponds to
+            the chunk size of the active level.
+
+        """
+        cdef uint32_t chunk_size = <uint32_t>1 << level
+
+        return chunk_size * self._buffer.elements_per_buffer
+
     cdef void _commit(self, bint force=False):
         """Populate queued elements into the data structure.
 
@@ -357,9 +412,7 @@ cdef class RandomSampling:
 
         """
         cdef uint16_t level = self._active_level()
-        cdef uint32_t chunk_size = <uint32_t>1 << level
-
-        cdef uint64_t autocommit_size = chunk_size * self._buffer.elements_per_buffer
+        cdef uint64_t autocommit_size = self._autocommit_size(level)
         cdef uint64_t num_of_candidates = len(self._queue)
 
         if num_of_candidates < 1:
@@ -394,11 +447,11 @@ cdef class RandomSampling:
     def __repr__(self):
         return (
             "<RandomSampling ("
-            "height: {}, "
-            "buffers: {}, "
-            "capacity: {}"
+            "height: %d, "
+            "buffers: %d, "
+            "capacity: %d"
             ")>"
-        ).format(
+        ) % (
             self.height,
             self._buffer.number_of_buffers,
             self._buffer.elements_per_buffer
@@ -429,6 +482,10 @@ cdef class RandomSampling:
 
         return size
 
+    def __sizeof__(self):
+        """Size of the object in bytes, including its storage."""
+        return object.__sizeof__(self) + self.sizeof()
+
     cpdef size_t count(self):
         """Get the number of processed elements."""
         return self._number_of_elements
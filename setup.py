@@ -1,4 +1,6 @@
 import os
+import platform
+import sys
 
 from distutils.sysconfig import get_python_inc
 from distutils.core import Extension, setup
@@ -21,6 +23,30 @@ PACKAGES = [
 ]
 
 
+def compile_args():
+    """Compiler flags that let the C++ backend vectorize hot loops."""
+    if sys.platform == 'win32':
+        return ['/O2', '/GL', '/arch:AVX2', '/std:c++17']
+
+    args = [
+        '-O3', '-std=c++17', '-funroll-loops', '-ftree-vectorize', '-flto']
+    if platform.machine() in ('aarch64', 'arm64'):
+        args.append('-mcpu=native')
+    else:
+        args.append('-march=native')
+    if sys.platform.startswith('linux'):
+        # Calls into libpython go through the GOT instead of the PLT.
+        args.append('-fno-plt')
+    return args
+
+
+def link_args():
+    """Linker flags that complete the link-time optimization."""
+    if sys.platform == 'win32':
+        return ['/LTCG']
+    return ['-O3', '-flto']
+
+
 def setup_package():
     root = os.path.abspath(os.path.dirname(__file__))
 
@@ -31,6 +57,10 @@ def setup_package():
     with open(os.path.join(root, 'README.rst')) as f:
         readme = f.read()
 
+    extra_compile_args = compile_args()
+    extra_link_args = link_args()
+    define_macros = [('NDEBUG', '1')]
+
     extensions = []
     extensions.append(
         Extension(
@@ -39,7 +69,10 @@ def setup_package():
             sources=['pdsa/membership/bloom_filter.pyx'],
             include_dirs=[
                 get_python_inc(plat_specific=True),
-            ]
+            ],
+            extra_compile_args=extra_compile_args,
+            extra_link_args=extra_link_args,
+            define_macros=define_macros
         )
     )
     extensions.append(
@@ -49,7 +82,10 @@ def setup_package():
             sources=['pdsa/membership/counting_bloom_filter.pyx'],
             include_dirs=[
                 get_python_inc(plat_specific=True),
-            ]
+            ],
+            extra_compile_args=extra_compile_args,
+            extra_link_args=extra_link_args,
+            define_macros=define_macros
         )
     )
     extensions.append(
@@ -59,7 +95,10 @@ def setup_package():
             sources=['pdsa/cardinality/linear_counter.pyx'],
             include_dirs=[
                 get_python_inc(plat_specific=True),
-            ]
+            ],
+            extra_compile_args=extra_compile_args,
+            extra_link_args=extra_link_args,
+            define_macros=define_macros
         )
     )
     extensions.append(
@@ -69,7 +108,10 @@ def setup_package():
             sources=['pdsa/cardinality/probabilistic_counter.pyx'],
             include_dirs=[
                 get_python_inc(plat_specific=True),
-            ]
+            ],
+            extra_compile_args=extra_compile_args,
+            extra_link_args=extra_link_args,
+            define_macros=define_macros
         )
     )
     extensions.append(
@@ -79,7 +121,10 @@ def setup_package():
             sources=['pdsa/cardinality/hyperloglog.pyx'],
             include_dirs=[
                 get_python_inc(plat_specific=True),
-            ]
+            ],
+            extra_compile_args=extra_compile_args,
+            extra_link_args=extra_link_args,
+            define_macros=define_macros
         )
     )
     extensions.append(
@@ -93,7 +138,24 @@ def setup_package():
             include_dirs=[
                 get_python_inc(plat_specific=True),
                 os.path.join('pdsa/helpers/hashing', 'src')
-            ]
+            ],
+            extra_compile_args=extra_compile_args,
+            extra_link_args=extra_link_args,
+            define_macros=define_macros
+        )
+    )
+    extensions.append(
+        Extension(
+            "pdsa.helpers.hashing.xxh",
+            language='c++',
+            sources=['pdsa/helpers/hashing/xxh.pyx'],
+            include_dirs=[
+                get_python_inc(plat_specific=True),
+                os.path.join('pdsa/helpers/hashing', 'src')
+            ],
+            extra_compile_args=extra_compile_args,
+            extra_link_args=extra_link_args,
+            define_macros=define_macros
         )
     )
     extensions.append(
@@ -107,7 +169,10 @@ def setup_package():
             include_dirs=[
                 get_python_inc(plat_specific=True),
                 os.path.join('pdsa/helpers/storage', 'src')
-            ]
+            ],
+            extra_compile_args=extra_compile_args,
+            extra_link_args=extra_link_args,
+            define_macros=define_macros
         )
     )
     extensions.append(
@@ -121,7 +186,10 @@ def setup_package():
             include_dirs=[
                 get_python_inc(plat_specific=True),
                 os.path.join('pdsa/helpers/storage', 'src')
-            ]
+            ],
+            extra_compile_args=extra_compile_args,
+            extra_link_args=extra_link_args,
+            define_macros=define_macros
         )
     )
     extensions.append(
@@ -131,7 +199,10 @@ def setup_package():
             sources=['pdsa/frequency/count_min_sketch.pyx'],
             include_dirs=[
                 get_python_inc(plat_specific=True),
-            ]
+            ],
+            extra_compile_args=extra_compile_args,
+            extra_link_args=extra_link_args,
+            define_macros=define_macros
         )
     )
     extensions.append(
@@ -141,7 +212,10 @@ def setup_package():
             sources=['pdsa/frequency/count_sketch.pyx'],
             include_dirs=[
                 get_python_inc(plat_specific=True),
-            ]
+            ],
+            extra_compile_args=extra_compile_args,
+            extra_link_args=extra_link_args,
+            define_macros=define_macros
         )
     )
     extensions.append(
@@ -151,7 +225,10 @@ def setup_package():
             sources=['pdsa/rank/random_sampling.pyx'],
             include_dirs=[
                 get_python_inc(plat_specific=True),
-            ]
+            ],
+            extra_compile_args=extra_compile_args,
+            extra_link_args=extra_link_args,
+            define_macros=define_macros
         )
     )
     extensions.append(
@@ -161,7 +238,10 @@ def setup_package():
             sources=['pdsa/rank/qdigest.pyx'],
             include_dirs=[
                 get_python_inc(plat_specific=True),
-            ]
+            ],
+            extra_compile_args=extra_compile_args,
+            extra_link_args=extra_link_args,
+            define_macros=define_macros
         )
     )
 
@@ -179,7 +259,14 @@ def setup_package():
         license=about['__license__'],
         ext_modules=cythonize(
             extensions,
-            compiler_directives={"language_level": "3str"}
+            compiler_directives={
+                "language_level": "3str",
+                "boundscheck": False,
+                "wraparound": False,
+                "cdivision": True,
+                "initializedcheck": False,
+                "nonecheck": False,
+            }
         ),
         classifiers=[
             'Environment :: Console',
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(scope="session")
+def keys():
+    """Prebuilt bytes keys, shared by the estimation tests of all counters."""
+    return tuple(b"element_%d" % i for i in range(100000))
@@ -1,11 +1,46 @@
-
-import array
 import pytest
+import sys
 
 from math import sqrt
 from pdsa.cardinality.hyperloglog import HyperLogLog
 
 
+ADD_INPUTS = ("test", 1, b'{"hello": "world"}')
+
+
+@pytest.fixture(scope="module")
+def trajectory(keys):
+    """Registers of a precision 10 counter at log-spaced cardinalities.
+
+    The counter is filled only once per module, tests restore it
+    at every recorded cardinality with `HyperLogLog.from_bytes()`.
+
+    """
+    precision = 10
+    hll = HyperLogLog(precision)
+
+    # Ignore small cardinality estimations,
+    # they will be tested in another test.
+    boundary = 2.5 * (1 << precision)
+
+    # Estimate at log-spaced checkpoints instead of after every element.
+    checkpoints = sorted({
+        int(boundary * 1.05 ** k) for k in range(1, 76)
+    })
+
+    # Seed the counter past the small range before recording.
+    cardinality = int(boundary) + 1
+    hll.add_many(keys[:cardinality])
+
+    registers = []
+    for checkpoint in checkpoints:
+        hll.add_many(keys[cardinality:checkpoint])
+        cardinality = checkpoint
+        registers.append((cardinality, hll.to_bytes()))
+
+    return registers
+
+
 def test_init():
     hll = HyperLogLog(10)
 
@@ -17,9 +52,16 @@ def test_init():
 
 def test_size():
     hll = HyperLogLog(10)
+    assert hll.sizeof() == len(hll), "Unexpected size in bytes"
+    assert sys.getsizeof(hll) > hll.sizeof(), "Storage is not accounted"
+
 
-    element_size = array.array('L', [1]).itemsize
-    assert hll.sizeof() == element_size * len(hll), "Unexpected size in bytes"
+def test_max_precision():
+    hll = HyperLogLog(16)
+    assert len(hll) == 65536
+
+    hll.add_many(["test", "test", "test2"])
+    assert hll.count() == 2
 
 
 def test_repr():
@@ -32,56 +74,125 @@ def test_repr():
 def test_add():
     hll = HyperLogLog(10)
 
-    for element in ["test", 1, {"hello": "world"}]:
+    for element in ADD_INPUTS:
         hll.add(element)
 
 
-def test_count():
+def test_add_many():
+    hll = HyperLogLog(10)
+
+    hll.add_many(["test", "test", "test2"])
+    assert hll.count() == 2
+
+
+def test_merge(keys):
+    hll = HyperLogLog(10)
+    hll.add_many(keys[:2000])
+
+    hll_first = HyperLogLog(10)
+    hll_first.add_many(keys[:1000])
+    hll_second = HyperLogLog(10)
+    hll_second.add_many(keys[500:2000])
+
+    hll_first.merge(hll_second)
+    assert hll_first.count() == hll.count()
+
+    with pytest.raises(ValueError) as excinfo:
+        hll.merge(HyperLogLog(6))
+    assert str(excinfo.value) == (
+        "Only counters with the same precision can be merged")
+
+    with pytest.raises(TypeError) as excinfo:
+        hll.merge(None)
+    assert str(excinfo.value) == "Cannot merge None into the counter"
+
+
+def test_count(trajectory):
+    precision = 10
+    std = 1.04 / sqrt(1 << precision)
+
+    error_sum = 0.0
+    num_of_estimations = 0
+    for cardinality, registers in trajectory:
+        hll = HyperLogLog.from_bytes(registers)
+
+        error = (cardinality - hll.count()) / float(cardinality)
+        error_sum += error
+        num_of_estimations += 1
+
+    avg_error = abs(error_sum) / num_of_estimations
+
+    assert avg_error >= 0
+    assert avg_error <= std
+
+
+def test_to_bytes(keys):
+    hll = HyperLogLog(10)
+    hll.add_many(keys[:2000])
+
+    registers = hll.to_bytes()
+    assert len(registers) == len(hll)
+
+    restored = HyperLogLog.from_bytes(registers)
+    assert len(restored) == len(hll)
+    assert restored.count() == hll.count()
+    assert restored.to_bytes() == registers
+
+    with pytest.raises(ValueError) as excinfo:
+        HyperLogLog.from_bytes(registers[:1000])
+    assert str(excinfo.value) == (
+        "Number of registers has to be 2^precision")
+
+
+def test_count_int():
     precision = 10
     hll = HyperLogLog(precision)
     std = 1.04 / sqrt(1 << precision)
 
-    errors = []
+    error_sum = 0.0
+    num_of_estimations = 0
 
     boundary = 2.5 * (1 << precision)
 
-    cardinality = 0
-    for i in range(100000):
-        cardinality += 1
-        element = "element_{}".format(i)
-        hll.add(element)
+    checkpoints = sorted({
+        int(boundary * 1.05 ** k) for k in range(1, 76)
+    })
+
+    cardinality = int(boundary) + 1
+    hll.add_many(range(cardinality))
 
-        if cardinality <= boundary:
-            # Ignore small cardinality estimations,
-            # they will be tested in another test.
-            continue
+    for checkpoint in checkpoints:
+        hll.add_many(range(cardinality, checkpoint))
+        cardinality = checkpoint
 
         error = (cardinality - hll.count()) / float(cardinality)
-        errors.append(error)
+        error_sum += error
+        num_of_estimations += 1
 
-    avg_error = abs(sum(errors)) / float(len(errors))
+    avg_error = abs(error_sum) / num_of_estimations
 
     assert avg_error >= 0
     assert avg_error <= std
 
 
-def test_count_small():
+def test_count_small(keys):
     precision = 6
     hll = HyperLogLog(precision)
     std = 1.04 / sqrt(1 << precision)
 
-    errors = []
+    error_sum = 0.0
+    num_of_estimations = 0
 
     cardinality = 0
-    for i in range(100):
+    for element in keys[:100]:
         cardinality += 1
-        element = "element_{}".format(i)
         hll.add(element)
 
         error = (cardinality - hll.count()) / float(cardinality)
-        errors.append(error)
+        error_sum += error
+        num_of_estimations += 1
 
-    avg_error = abs(sum(errors)) / float(len(errors))
+    avg_error = abs(error_sum) / num_of_estimations
 
     assert avg_error >= 0
     assert avg_error <= std
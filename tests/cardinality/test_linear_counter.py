@@ -3,6 +3,14 @@ import pytest
 from pdsa.cardinality.linear_counter import LinearCounter
 
 
+ADD_INPUTS = ("test", 1, b'{"hello": "world"}')
+
+
+@pytest.fixture
+def lc100k():
+    return LinearCounter(100000)
+
+
 def test_init():
     lc = LinearCounter(8000)
     assert lc.sizeof() == 1000, "Unexpected size in bytes"
@@ -21,12 +29,19 @@ def test_repr():
 def test_add():
     lc = LinearCounter(8000)
 
-    for word in ["test", 1, {"hello": "world"}]:
+    for word in ADD_INPUTS:
         lc.add(word)
 
 
-def test_count_small():
-    lc = LinearCounter(100000)
+def test_add_many(lc100k):
+    lc = lc100k
+
+    lc.add_many(["test", "test", "test2"])
+    assert lc.count() == 2
+
+
+def test_count_small(lc100k):
+    lc = lc100k
 
     assert lc.count() == 0
 
@@ -40,29 +55,32 @@ def test_count_small():
     assert lc.count() == 2
 
 
-def test_count():
-    lc = LinearCounter(100000)
+def test_count(keys, lc100k):
+    lc = lc100k
 
-    errors = []
+    error_sum = 0.0
+    num_of_estimations = 0
 
     cardinality = 0
-    for i in range(100):
+    for element in keys[:100]:
         cardinality += 1
-        element = "element_{}".format(i)
         lc.add(element)
 
         error = abs(cardinality - lc.count()) / float(cardinality)
-        errors.append(error)
+        error_sum += error
+        num_of_estimations += 1
 
-    avg_error = sum(errors) / float(len(errors))
+    avg_error = error_sum / num_of_estimations
 
     assert avg_error >= 0
     assert avg_error <= 0.1
 
 
-def test_len():
-    lc = LinearCounter(8000)
-    assert len(lc) == 8000
-
-    lc = LinearCounter(8001)
-    assert len(lc) == 8008
+@pytest.mark.parametrize("length,expected_length,expected_size", [
+    (8000, 8000, 1000),
+    (8001, 8008, 1001),
+])
+def test_len(length, expected_length, expected_size):
+    lc = LinearCounter(length)
+    assert len(lc) == expected_length
+    assert lc.sizeof() == expected_size, "Unexpected size in bytes"
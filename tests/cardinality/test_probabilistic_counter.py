@@ -4,6 +4,9 @@ from math import sqrt
 from pdsa.cardinality.probabilistic_counter import ProbabilisticCounter
 
 
+ADD_INPUTS = ("test", 1, b'{"hello": "world"}')
+
+
 def test_init():
     pc = ProbabilisticCounter(10)
     assert pc.sizeof() == 40, "Unexpected size in bytes"
@@ -23,43 +26,63 @@ def test_repr():
 def test_add():
     pc = ProbabilisticCounter(10)
 
-    for word in ["test", 1, {"hello": "world"}]:
+    for word in ADD_INPUTS:
         pc.add(word)
 
 
-def test_count():
+def test_add_many():
+    pc = ProbabilisticCounter(256)
+
+    pc.add("test")
+    cardinality = pc.count()
+    assert cardinality > 0
+
+    pc.add_many(["test", "test"])
+    assert pc.count() == cardinality
+
+
+def test_count(keys):
     num_of_counters = 256
-    pc = ProbabilisticCounter(num_of_counters)
     std = 0.78 / sqrt(num_of_counters)
 
-    errors = []
+    error_sum = 0.0
+    num_of_estimations = 0
 
+    # For small cardinalities we need to use correction,
+    # that we will test in another case.
     boundary = 20 * num_of_counters
 
-    cardinality = 0
-    for i in range(10000):
-        cardinality += 1
-        element = "element_{}".format(i)
-        pc.add(element)
+    # Estimate at log-spaced checkpoints instead of after every element.
+    checkpoints = sorted({
+        int(boundary * 1.05 ** k) for k in range(0, 14)
+    } | {10000})
 
-        if cardinality < boundary:
-            # For small cardinalities we need to use correction,
-            # that we will test in another case.
-            continue
+    # Estimates along a single stream are strongly correlated, so
+    # the error is averaged over several disjoint streams of keys.
+    num_of_streams = 10
+    stream_length = checkpoints[-1]
+    for stream_index in range(num_of_streams):
+        pc = ProbabilisticCounter(num_of_counters)
+        stream = keys[
+            stream_index * stream_length:(stream_index + 1) * stream_length]
 
-        error = (cardinality - pc.count()) / float(cardinality)
-        errors.append(error)
+        cardinality = 0
+        for checkpoint in checkpoints:
+            pc.add_many(stream[cardinality:checkpoint])
+            cardinality = checkpoint
 
-    avg_error = abs(sum(errors)) / float(len(errors))
+            error = (cardinality - pc.count()) / float(cardinality)
+            error_sum += error
+            num_of_estimations += 1
+
+    avg_error = abs(error_sum) / num_of_estimations
 
     assert avg_error >= 0
     assert avg_error <= std
 
 
-def test_count_small():
+def test_count_small(keys):
     num_of_counters = 256
-    pc = ProbabilisticCounter(
-        num_of_counters, with_small_cardinality_correction=True)
 
     # Actually, for small cardinalities we have no estimate. It is
     # just seems that the the errors have to be bigger.
@@ -67,48 +90,63 @@ def test_count_small():
 
     boundary = 2 * num_of_counters
 
-    errors = []
+    error_sum = 0.0
+    num_of_estimations = 0
 
-    cardinality = 0
-    for i in range(boundary):
-        cardinality += 1
-        element = "element_{}".format(i)
-        pc.add(element)
+    # Estimates below num_of_counters elements are meaningless,
+    # so log-spaced checkpoints start there.
+    checkpoints = sorted({
+        int(num_of_counters * 1.05 ** k) for k in range(0, 15)
+    } | {boundary})
+
+    num_of_streams = 10
+    stream_length = checkpoints[-1]
+    for stream_index in range(num_of_streams):
+        pc = ProbabilisticCounter(
+            num_of_counters, with_small_cardinality_correction=True)
+        stream = keys[
+            stream_index * stream_length:(stream_index + 1) * stream_length]
+
+        cardinality = 0
+        for checkpoint in checkpoints:
+            pc.add_many(stream[cardinality:checkpoint])
+            cardinality = checkpoint
 
-        error = (cardinality - pc.count()) / float(cardinality)
-        errors.append(error)
+            error = (cardinality - pc.count()) / float(cardinality)
+            error_sum += error
+            num_of_estimations += 1
 
-    avg_error = abs(sum(errors)) / float(len(errors))
+    avg_error = abs(error_sum) / num_of_estimations
 
     assert avg_error >= 0
     assert avg_error <= 3 * std  # There is no known theoretical expectation.
 
 
-def test_correction():
+def test_correction(keys):
     pc_with_corr = ProbabilisticCounter(
         256, with_small_cardinality_correction=True)
     pc = ProbabilisticCounter(256)
 
-    errors = []
-    errors_with_corr = []
+    error_sum = 0.0
+    error_with_corr_sum = 0.0
+    num_of_estimations = 0
 
     cardinality = 0
-    for i in range(100):
+    for element in keys[:100]:
         cardinality += 1
-        element = "element_{}".format(i)
         pc_with_corr.add(element)
         pc.add(element)
 
         error_with_corr = (
             cardinality - pc_with_corr.count()) / float(cardinality)
-        errors_with_corr.append(error_with_corr)
+        error_with_corr_sum += error_with_corr
 
         error = abs(cardinality - pc.count()) / float(cardinality)
-        errors.append(error)
+        error_sum += error
+        num_of_estimations += 1
 
-    avg_error_with_corr = abs(sum(errors_with_corr)) / \
-        float(len(errors_with_corr))
-    avg_error = abs(sum(errors)) / float(len(errors))
+    avg_error_with_corr = abs(error_with_corr_sum) / num_of_estimations
+    avg_error = abs(error_sum) / num_of_estimations
 
     assert avg_error_with_corr < avg_error
 
@@ -1,10 +1,17 @@
 
 import array
 import pytest
+import random
+import sys
+
+from collections import Counter
 
 from pdsa.frequency.count_min_sketch import CountMinSketch
 
 
+ADD_INPUTS = ("test", 1, b'{"hello": "world"}')
+
+
 def test_init():
     cms = CountMinSketch(2, 4)
 
@@ -24,6 +31,7 @@ def test_size():
 
     element_size = array.array('I', [1]).itemsize
     assert cms.sizeof() == element_size * len(cms), "Unexpected size in bytes"
+    assert sys.getsizeof(cms) > cms.sizeof(), "Storage is not accounted"
 
 
 def test_create_from_expected_error():
@@ -52,7 +60,7 @@ def test_repr():
 def test_add():
     cms = CountMinSketch(4, 100)
 
-    for word in ["test", 1, {"hello": "world"}]:
+    for word in ADD_INPUTS:
         cms.add(word)
         assert cms.frequency(word) == 1, "Can't find frequency for element"
 
@@ -65,6 +73,32 @@ def test_frequency():
     assert cms.frequency("test_test") == 0, "False positive detected"
 
 
+def test_frequency_overestimate():
+    rng = random.Random(42)
+    words = [int(rng.paretovariate(0.5)) for _ in range(20000)]
+    frequencies = Counter(words)
+
+    overestimates = {}
+    for num_of_counters in (1, 5):
+        cms = CountMinSketch(num_of_counters, 200)
+        for word in words:
+            cms.add(word)
+
+        overestimates[num_of_counters] = [
+            cms.frequency(word) - frequency
+            for word, frequency in frequencies.items()
+        ]
+        assert min(overestimates[num_of_counters]) >= 0, (
+            "Frequency is underestimated")
+
+    # Independent counter arrays have to reduce the overestimate
+    # of a single array considerably.
+    single_array_error = sum(overestimates[1]) / len(frequencies)
+    sketch_error = sum(overestimates[5]) / len(frequencies)
+    assert sketch_error < single_array_error / 4, (
+        "Counter arrays are not independent")
+
+
 def test_len():
     cms = CountMinSketch(2, 4)
     assert len(cms) == 8
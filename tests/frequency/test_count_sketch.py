@@ -1,9 +1,16 @@
 import array
 import pytest
+import random
+import sys
+
+from collections import Counter
 
 from pdsa.frequency.count_sketch import CountSketch
 
 
+ADD_INPUTS = ("test", 1, b'{"hello": "world"}')
+
+
 def test_init():
     cs = CountSketch(2, 4)
     assert cs.sizeof() == 32, 'Unexpected size in bytes'
@@ -24,6 +31,7 @@ def test_size():
 
     element_size = array.array('i', [1]).itemsize
     assert cs.sizeof() == element_size * len(cs), "Unexpected size in bytes"
+    assert sys.getsizeof(cs) > cs.sizeof(), "Storage is not accounted"
 
 
 def test_create_from_expected_error():
@@ -52,11 +60,23 @@ def test_repr():
 def test_add():
     cs = CountSketch(4, 100)
 
-    for word in ["test", 1, {"hello": "world"}]:
+    for word in ADD_INPUTS:
         cs.add(word)
         assert cs.frequency(word) == 1, "Can't find frequency for element"
 
 
+def test_add_many():
+    cs = CountSketch(4, 100)
+
+    cs.add_many(["test", "test", 1])
+    assert cs.frequency("test") == 2, "Can't find frequency for element"
+    assert cs.frequency(1) == 1, "Can't find frequency for element"
+
+    cs.add_many(["test"] * 1000 + ["test2"])
+    assert cs.frequency("test") == 1002, "Can't find frequency for element"
+    assert cs.frequency("test2") == 1, "Can't find frequency for element"
+
+
 def test_frequency():
     cs = CountSketch(4, 100)
 
@@ -65,6 +85,55 @@ def test_frequency():
     assert cs.frequency("test_test") == 0, "False positive detected"
 
 
+def test_frequency_error_by_depth():
+    rng = random.Random(42)
+    words = [int(rng.paretovariate(0.5)) for _ in range(20000)]
+    frequencies = Counter(words)
+
+    errors = []
+    for num_of_counters in (5, 8, 10):
+        cs = CountSketch(num_of_counters, 200)
+        cs.add_many(words)
+        errors.append(sum(
+            abs(cs.frequency(word) - frequency)
+            for word, frequency in frequencies.items()
+        ) / len(frequencies))
+
+    assert errors == sorted(errors, reverse=True), (
+        "Deeper sketch has larger error")
+
+
+def test_reset():
+    cs = CountSketch(4, 100)
+
+    cs.add_many(["test"] * 4 + ["test2"])
+    cs.reset()
+    assert cs.frequency("test") == 2, "Counters are not halved"
+    assert cs.frequency("test2") == 0, "Counters are not halved"
+
+
+def test_merge():
+    cs = CountSketch(4, 100)
+    cs.add_many(["test", "test", 1])
+
+    cs_other = CountSketch(4, 100)
+    cs_other.add_many(["test", 2])
+
+    cs.merge(cs_other)
+    assert cs.frequency("test") == 3, "Frequencies are not summed"
+    assert cs.frequency(1) == 1, "Frequencies are not summed"
+    assert cs.frequency(2) == 1, "Frequencies are not summed"
+
+    with pytest.raises(ValueError) as excinfo:
+        cs.merge(CountSketch(4, 200))
+    assert str(excinfo.value) == (
+        "Only sketches with the same dimensions can be merged")
+
+    with pytest.raises(TypeError) as excinfo:
+        cs.merge(None)
+    assert str(excinfo.value) == "Cannot merge None into the sketch"
+
+
 def test_len():
     cs = CountSketch(2, 4)
     assert len(cs) == 8
@@ -1,12 +1,21 @@
 import pytest
 
-from pdsa.helpers.hashing.mmh import mmh3_x86_32bit
+from pdsa.helpers.hashing.mmh import mmh3_x86_32bit, mmh3_x64_128bit
 
 
 def test_int():
     assert mmh3_x86_32bit(1024, 42) == 1170829763
 
 
+def test_big_int():
+    assert mmh3_x86_32bit(1 << 40, 42) == 2698199609
+    assert mmh3_x86_32bit(1 << 40, 42) != mmh3_x86_32bit((1 << 40) + 1, 42)
+
+    # Integers beyond 64 bits are hashed by their representation.
+    assert mmh3_x86_32bit(1 << 70, 42) == mmh3_x86_32bit(
+        repr(1 << 70).encode("utf-8"), 42)
+
+
 def test_string():
     assert mmh3_x86_32bit("test", 42) == 1956065189
     assert mmh3_x86_32bit("test", 42) != mmh3_x86_32bit(b"test", 42)
@@ -28,3 +37,13 @@ def test_seed():
     assert mmh3_x86_32bit("hello", 73) != mmh3_x86_32bit("hello", 42)
     assert mmh3_x86_32bit("hello", 42) == mmh3_x86_32bit("hello", 42)
     assert mmh3_x86_32bit("hello", 42) == mmh3_x86_32bit("hello")
+
+
+def test_x64_128bit():
+    assert mmh3_x64_128bit(b"", 0) == (0, 0)
+    assert mmh3_x64_128bit(
+        b"The quick brown fox jumps over the lazy dog", 0) == (
+        0xe34bbc7bbc071b6c, 0x7a433ca9c49a9347)
+    assert mmh3_x64_128bit("test", 42) != mmh3_x64_128bit(b"test", 42)
+    assert mmh3_x64_128bit("hello", 73) != mmh3_x64_128bit("hello", 42)
+    assert mmh3_x64_128bit("hello", 42) == mmh3_x64_128bit("hello")
@@ -0,0 +1,47 @@
+import pytest
+
+from pdsa.helpers.hashing.xxh import xxh3_64bit, xxh3_128bit
+
+
+def test_int():
+    assert xxh3_64bit(1024, 42) == 12197156605980312323
+
+
+def test_big_int():
+    assert xxh3_64bit(1 << 40, 42) == 4733549775937087482
+    assert xxh3_64bit(1 << 40, 42) != xxh3_64bit((1 << 40) + 1, 42)
+
+    # Integers beyond 64 bits are hashed by their representation.
+    assert xxh3_64bit(1 << 70, 42) == xxh3_64bit(
+        repr(1 << 70).encode("utf-8"), 42)
+
+
+def test_string():
+    assert xxh3_64bit("test", 42) == 587053424504820567
+    assert xxh3_64bit("test", 42) != xxh3_64bit(b"test", 42)
+
+
+def test_bytes():
+    assert xxh3_64bit(b"", 0) == 0x2d06800538d394c2
+    assert xxh3_64bit(b"test", 42) == 14938656095968196916
+
+
+def test_arbitrary():
+    class X(object):
+        def __repr__(self):
+            return "X<>"
+
+    assert xxh3_64bit(X(), 42) == xxh3_64bit("X<>".encode("utf-8"), 42)
+
+
+def test_seed():
+    assert xxh3_64bit("hello", 73) != xxh3_64bit("hello", 42)
+    assert xxh3_64bit("hello", 42) == xxh3_64bit("hello", 42)
+    assert xxh3_64bit("hello", 42) == xxh3_64bit("hello")
+
+
+def test_128bit():
+    assert xxh3_128bit(b"", 0) == (0x6001c324468d497f, 0x99aa06d3014798d8)
+    assert xxh3_128bit("test", 42) != xxh3_128bit(b"test", 42)
+    assert xxh3_128bit("hello", 73) != xxh3_128bit("hello", 42)
+    assert xxh3_128bit("hello", 42) == xxh3_128bit("hello")
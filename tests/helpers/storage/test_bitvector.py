@@ -65,3 +65,8 @@ def test_count():
 
     bv[42] = 1
     assert bv.count() == 1
+
+    bv = BitVector(200)
+    for i in range(0, 200, 3):
+        bv[i] = 1
+    assert bv.count() == 67
@@ -93,3 +93,48 @@ def test_decrement_zero():
     assert bc[22] == 0
     bc.decrement(22)
     assert bc[22] == 0
+
+
+def test_neighbours():
+    bc = BitVectorCounter(42)
+
+    for i in range(3):
+        bc.increment(20)
+    bc.increment(21)
+    assert bc[20] == 3
+    assert bc[21] == 1
+
+    bc.decrement(20)
+    assert bc[20] == 2
+    assert bc[21] == 1
+
+    bc.decrement(21)
+    assert bc[20] == 2
+    assert bc[21] == 0
+
+
+def test_increment_many():
+    bc = BitVectorCounter(42)
+
+    bc.increment_many([21] * 16 + [22, 22, 37])
+    assert bc[21] == 15
+    assert bc[22] == 2
+    assert bc[37] == 1
+    assert bc[20] == 0
+
+    with pytest.raises(IndexError):
+        bc.increment_many([1, 43])
+
+
+def test_count():
+    bc = BitVectorCounter(42)
+    assert bc.count() == 0
+
+    bc.increment_many([0, 0, 5, 21, 22, 41])
+    assert bc.count() == 5
+
+    bc.decrement(5)
+    assert bc.count() == 4
+
+    bc.decrement(0)
+    assert bc.count() == 4
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture
+def bulk_keys(request):
+    """Prebuilt bytes keys, their number is given by the parametrization."""
+    return [b"test%d" % i for i in range(request.param)]
@@ -3,6 +3,9 @@ import pytest
 from pdsa.membership.bloom_filter import BloomFilter
 
 
+ADD_INPUTS = ("test", 1, b'{"hello": "world"}')
+
+
 def test_init():
     bf = BloomFilter(8000, 3)
     assert bf.sizeof() == 1000, "Unexpected size in bytes"
@@ -45,11 +48,19 @@ def test_repr():
 def test_add():
     bf = BloomFilter(8000, 3)
 
-    for word in ["test", 1, {"hello": "world"}]:
+    for word in ADD_INPUTS:
         bf.add(word)
         assert bf.test(word) == 1, "Can't find recently added element"
 
 
+def test_add_many():
+    bf = BloomFilter(8000, 3)
+
+    bf.add_many(["test", 1, {"hello": "world"}])
+    for word in ["test", 1, {"hello": "world"}]:
+        assert bf.test(word) == 1, "Can't find recently added element"
+
+
 def test_lookup():
     bf = BloomFilter(8000, 3)
 
@@ -72,18 +83,22 @@ def test_count():
     assert bf.count() == 2
 
 
-def test_count_when_full():
+@pytest.mark.parametrize("bulk_keys", [
+    20,
+    10000,
+    pytest.param(1000000, marks=pytest.mark.slow),
+], indirect=True)
+def test_count_when_full(bulk_keys):
     length = 8
     num_of_hashes = 2
 
     bf = BloomFilter(length, num_of_hashes)
 
-    # We index 20 strings to kind of guarantee that
+    # We index at least 20 keys to kind of guarantee that
     # filter of length 8 is full afterwards.
     # NOTE: In perfect situation, only 4 items are required,
     # but we don't know which ones.
-    for i in range(20):
-        bf.add("test{}".format(i))
+    bf.add_many(bulk_keys)
 
     assert bf.count() == length / num_of_hashes
 
@@ -3,9 +3,12 @@ import pytest
 from pdsa.membership.counting_bloom_filter import CountingBloomFilter
 
 
+ADD_INPUTS = ("test", 1, b'{"hello": "world"}')
+
+
 def test_init():
     bf = CountingBloomFilter(8000, 3)
-    assert bf.sizeof() == 5000, "Unexpected size in bytes"
+    assert bf.sizeof() == 4000, "Unexpected size in bytes"
 
     with pytest.raises(ValueError) as excinfo:
         bf = CountingBloomFilter(8000, 0)
@@ -18,7 +21,7 @@ def test_init():
 
 def test_init_from_capacity():
     bf = CountingBloomFilter.create_from_capacity(5000, 0.02)
-    assert bf.sizeof() == 25445, "Unexpected size in bytes"
+    assert bf.sizeof() == 20356, "Unexpected size in bytes"
 
     with pytest.raises(ValueError) as excinfo:
         bf = CountingBloomFilter.create_from_capacity(5000, 2)
@@ -29,7 +32,7 @@ def test_init_from_capacity():
     assert str(excinfo.value) == 'Filter capacity can\'t be 0 or negative'
 
     bf = CountingBloomFilter.create_from_capacity(5000, 0.999)
-    assert len(bf) == 16
+    assert len(bf) == 10
 
 
 def test_repr():
@@ -45,11 +48,19 @@ def test_repr():
 def test_add():
     bf = CountingBloomFilter(8000, 3)
 
-    for word in ["test", 1, {"hello": "world"}]:
+    for word in ADD_INPUTS:
         bf.add(word)
         assert bf.test(word) == 1, "Can't find recently added element"
 
 
+def test_add_many():
+    bf = CountingBloomFilter(8000, 3)
+
+    bf.add_many(["test", 1, {"hello": "world"}])
+    for word in ["test", 1, {"hello": "world"}]:
+        assert bf.test(word) == 1, "Can't find recently added element"
+
+
 def test_lookup():
     bf = CountingBloomFilter(8000, 3)
 
@@ -72,18 +83,22 @@ def test_count():
     assert bf.count() == 2
 
 
-def test_count_when_full():
+@pytest.mark.parametrize("bulk_keys", [
+    20,
+    10000,
+    pytest.param(1000000, marks=pytest.mark.slow),
+], indirect=True)
+def test_count_when_full(bulk_keys):
     length = 8
     num_of_hashes = 2
 
     bf = CountingBloomFilter(length, num_of_hashes)
 
-    # We index 20 strings to kind of guarantee that
+    # We index at least 20 keys to kind of guarantee that
     # filter of length 8 is full afterwards.
     # NOTE: In perfect situation, only 4 items are required,
     # but we don't know which ones.
-    for i in range(20):
-        bf.add("test{}".format(i))
+    bf.add_many(bulk_keys)
 
     assert bf.count() == length / num_of_hashes
 
@@ -93,7 +108,7 @@ def test_len():
     assert len(bf) == 8000
 
     bf = CountingBloomFilter(8001, 3)
-    assert len(bf) == 8008
+    assert len(bf) == 8002
 
 
 def test_delete():
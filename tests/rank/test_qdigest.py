@@ -69,6 +69,21 @@ def test_add():
     assert str(excinfo.value) == 'Value out of range'
 
 
+def test_add_many():
+    qd = QuantileDigest(3, 5)
+    qd.add_many(range(8))
+
+    assert len(qd) == 15, "Incorrect length"
+    assert qd.count() == 8, "Invalid tree"
+
+    qd.add_many([0] * 10, compress=True)
+    assert qd.count() == 18, "Invalid counts"
+
+    with pytest.raises(ValueError) as excinfo:
+        qd.add_many([1, 1024])
+    assert str(excinfo.value) == 'Value out of range'
+
+
 def test_compress():
     qd = QuantileDigest(3, 3)
 
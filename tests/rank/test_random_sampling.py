@@ -50,6 +50,15 @@ def test_length():
     assert len(rs) == num_of_buffers, "Incorrect number of buffers"
 
 
+def test_add_many():
+    num_of_buffers = 16
+    rs = RandomSampling(num_of_buffers, 5, 3)
+
+    rs.add_many(range(20))
+    assert rs.count() == 20, "Incorrect number of elements"
+    assert len(rs) == num_of_buffers, "Incorrect number of buffers"
+
+
 def test_sizeof():
     num_of_buffers = 16
     buffer_capacity = 3
@@ -76,11 +85,8 @@ def test_median_and_rank():
     random.seed(42)
     num_of_elements = 100000
 
-    dataset = []
-    for i in range(num_of_elements):
-        element = random.randrange(0, 16)
-        dataset.append(element)
-        rs.add(element)
+    dataset = [random.randrange(0, 16) for _ in range(num_of_elements)]
+    rs.add_many(dataset)
 
     exact_median = int(median(dataset))
 